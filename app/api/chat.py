@@ -1,21 +1,67 @@
 """
 Chat API endpoints for the AI Student Support Service.
 """
-from typing import List, Dict, Any
+from typing import AsyncIterator, List, Dict, Any
+import orjson
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import Response, StreamingResponse
+from app.services.ai_service import AIResult
 from app.models.chat import ChatRequest, ChatResponse, ServicesStatusResponse, ChatData, ServicesStatusData
+from app.models.status import SERVICES_STATUS_RESPONSE_ADAPTER
 from app.utils.logger import get_logger
-from app.utils.service_manager import get_global_services
+from app.utils.service_manager import Services, services_dep
+from app.utils.service_utils import probe_services_status
 
 logger = get_logger(__name__)
 router = APIRouter()
 
+# Precomputed context labels; sliced per request instead of formatted. Covers CAG_MAX_CHUNKS' upper bound
+_DOC_LABELS = tuple(f"Document {i}" for i in range(1, 129))
 
-@router.post("/", response_model=ChatResponse)
-async def chat_with_ai(request: ChatRequest) -> ChatResponse:
+
+def _build_chat_data(result: AIResult, include_context: bool = False) -> ChatData:
+    """Build ChatData from the AI service's result. RAG payloads are only included on request.
+    
+    AIResult fields are already typed by the AI service, so validation is skipped.
+    """
+    metadata = {
+        "llm_used": result.llm_used,
+        "message_type": result.message_type,
+        "rag_documents_count": len(result.rag_documents),
+        "escalation_message": result.escalation_message
+    }
+    if include_context:
+        metadata["rag_scores"] = result.rag_scores
+        metadata["rag_documents"] = result.rag_documents
+    
+    return ChatData.model_construct(
+        response=result.response,
+        confidence_score=result.confidence,
+        escalated=result.escalated,
+        escalation_reason=result.escalation_reason,
+        context_used=list(_DOC_LABELS[:len(result.rag_documents)]),
+        metadata=metadata
+    )
+
+
+def _log_chat_result(chat_data: ChatData) -> None:
+    """Log the outcome of a chat request."""
+    # Log escalation if it occurred
+    if chat_data.escalated:
+        logger.info("Query escalated: %s", chat_data.escalation_reason)
+        logger.info("Escalation data generated for backend processing")
+    
+    logger.info(
+        "Chat response generated successfully (confidence: %.2f, escalated: %s, type: %s)",
+        chat_data.confidence_score, chat_data.escalated, chat_data.metadata.get("message_type")
+    )
+
+
+@router.post("/", responses={200: {"model": ChatResponse}})
+async def chat_with_ai(request: ChatRequest, services: Services = Depends(services_dep)) -> Response:
     """Chat with AI using simplified single-call RAG-enhanced responses."""
     try:
-        ai_service, _ , chroma_service = get_global_services()
+        ai_service, _, chroma_service = services
         
         # Check service availability
         if not ai_service or not ai_service.is_available():
@@ -30,88 +76,70 @@ async def chat_with_ai(request: ChatRequest) -> ChatResponse:
             chat_history=request.chat_history
         )
         
-        # Validate result
-        if not result:
-            raise HTTPException(status_code=500, detail="AI service returned no response")
-        
-        # Extract values from simplified response
-        answer = result.get("response", "Sorry, I couldn't generate a response.")
-        confidence = result.get("confidence", 0.0)
-        escalated = result.get("escalated", False)
-        escalation_reason = result.get("escalation_reason")
-        escalation_message = result.get("escalation_message")
-        message_type = result.get("message_type", "other")
-        llm_used = result.get("llm_used", "unknown")
-        rag_documents = result.get("rag_documents", [])
-        rag_scores = result.get("rag_scores", [])
-        
-        # Build response data
-        response_data = ChatData(
-            response=answer,
-            confidence_score=confidence,
-            escalated=escalated,
-            escalation_reason=escalation_reason,
-            context_used=[f"Document {i+1}" for i in range(len(rag_documents))],
-            metadata={
-                "llm_used": llm_used,
-                "message_type": message_type,
-                "rag_documents_count": len(rag_documents),
-                "rag_scores": rag_scores,
-                "rag_documents": rag_documents,
-                "escalation_message": escalation_message
-            }
-        )
+        response_data = _build_chat_data(result, request.include_context)
         
         # Build standardized response
-        response = ChatResponse(
+        response = ChatResponse.model_construct(
             success=True,
             message="Chat response generated successfully",
             data=response_data
         )
         
-        # Log escalation if it occurred
-        if escalated:
-            logger.info(f"Query escalated: {escalation_reason}")
-            logger.info(f"Escalation data generated for backend processing")
+        _log_chat_result(response_data)
         
-        logger.info(f"Chat response generated successfully (confidence: {confidence:.2f}, escalated: {escalated}, type: {message_type})")
-        return response
+        # Validation was skipped on purpose above: AIResult fields are already typed
+        return Response(content=response.model_dump_json(), media_type="application/json")
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error in chat endpoint: {e}")
+        logger.error("Error in chat endpoint: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@router.get("/status", response_model=ServicesStatusResponse)
-async def get_services_status() -> ServicesStatusResponse:
+@router.post("/stream")
+async def chat_with_ai_stream(request: ChatRequest, services: Services = Depends(services_dep)) -> StreamingResponse:
+    """Chat with AI, streaming the answer as Server-Sent Events."""
+    ai_service, _, chroma_service = services
+    
+    # Check service availability before the stream starts
+    if not ai_service or not ai_service.is_available():
+        raise HTTPException(status_code=503, detail="AI service not available")
+    
+    if not chroma_service or not chroma_service.is_available():
+        raise HTTPException(status_code=503, detail="Knowledge base not available")
+    
+    async def event_stream() -> AsyncIterator[str]:
+        try:
+            async for event in ai_service.chat_with_ai_stream(
+                user_message=request.message,
+                chat_history=request.chat_history
+            ):
+                if event.get("done"):
+                    chat_data = _build_chat_data(event["result"], request.include_context)
+                    _log_chat_result(chat_data)
+                    yield f"data: {orjson.dumps({'done': True, 'metadata': chat_data.model_dump()}).decode()}\n\n"
+                else:
+                    yield f"data: {orjson.dumps({'delta': event['delta']}).decode()}\n\n"
+        except Exception as e:
+            logger.error("Error in chat stream endpoint: %s", e)
+            yield f"data: {orjson.dumps({'done': True, 'error': 'Internal server error'}).decode()}\n\n"
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@router.get("/status", responses={200: {"model": ServicesStatusResponse}})
+async def get_services_status(services: Services = Depends(services_dep)) -> Response:
     """Get comprehensive status of all services."""
     try:
-        ai_service, rag_service, chroma_service = get_global_services()
-        
-        services_status = {}
-        
-        # Get AI service status
-        if ai_service and hasattr(ai_service, 'get_status'):
-            try:
-                services_status["ai_service"] = ai_service.get_status()
-            except Exception as e:
-                services_status["ai_service"] = {"status": "error", "error": str(e)}
-        
-        # Get RAG service status
-        if rag_service and hasattr(rag_service, 'get_status'):
-            try:
-                services_status["rag_service"] = rag_service.get_status()
-            except Exception as e:
-                services_status["rag_service"] = {"status": "error", "error": str(e)}
+        ai_service, rag_service, chroma_service = services
         
-        # Get ChromaDB service status
-        if chroma_service and hasattr(chroma_service, 'get_status'):
-            try:
-                services_status["chroma_service"] = chroma_service.get_status()
-            except Exception as e:
-                services_status["chroma_service"] = {"status": "error", "error": str(e)}
+        # Probe all services concurrently
+        services_status = await probe_services_status({
+            "ai_service": ai_service,
+            "rag_service": rag_service,
+            "chroma_service": chroma_service
+        })
         
         # Build response data
         status_data = ServicesStatusData(services=services_status)
@@ -123,8 +151,8 @@ async def get_services_status() -> ServicesStatusResponse:
             data=status_data
         )
         
-        return response
+        return Response(content=SERVICES_STATUS_RESPONSE_ADAPTER.dump_json(response), media_type="application/json")
         
     except Exception as e:
-        logger.error(f"Error getting services status: {e}")
+        logger.error("Error getting services status: %s", e)
         raise HTTPException(status_code=500, detail="Failed to retrieve services status")
@@ -2,15 +2,18 @@
 Document management API endpoints for the AI Student Support Service.
 """
 from typing import List
-from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File
+from fastapi.responses import Response
 from app.models.documents import (
     PDFUploadResponse, PDFUploadData, TextDocumentRequest, 
     TextDocumentResponse, TextDocumentData, GetDocumentsResponse, 
-    GetDocumentsData, DeleteDocumentResponse
+    GetDocumentsData, DeleteDocumentResponse, PDF_UPLOAD_RESPONSE_ADAPTER,
+    TEXT_DOCUMENT_RESPONSE_ADAPTER, GET_DOCUMENTS_RESPONSE_ADAPTER,
+    DELETE_DOCUMENT_RESPONSE_ADAPTER
 )
 from app.services.document_service import DocumentService
 from app.utils.logger import get_logger
-from app.utils.service_manager import get_global_services
+from app.utils.service_manager import Services, services_dep
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -19,11 +22,11 @@ router = APIRouter()
 document_service = DocumentService()
 
 
-@router.post("/text", response_model=TextDocumentResponse)
-async def add_text_document(request: TextDocumentRequest) -> TextDocumentResponse:
+@router.post("/text", responses={200: {"model": TextDocumentResponse}})
+async def add_text_document(request: TextDocumentRequest, services: Services = Depends(services_dep)) -> Response:
     """Add a text document to the knowledge base."""
     try:
-        _, _, chroma_service = get_global_services()
+        _, _, chroma_service = services
         
         if not chroma_service or not chroma_service.is_available():
             raise HTTPException(status_code=503, detail="Knowledge base not available")
@@ -38,7 +41,7 @@ async def add_text_document(request: TextDocumentRequest) -> TextDocumentRespons
             raise HTTPException(status_code=500, detail="Failed to add text document")
         
         # Build response data
-        response_data = TextDocumentData(
+        response_data = TextDocumentData.model_construct(
             document_id=document_service.last_document_id,
             content_length=len(request.content),
             message="Document processed successfully"
@@ -51,21 +54,21 @@ async def add_text_document(request: TextDocumentRequest) -> TextDocumentRespons
             data=response_data
         )
         
-        logger.info(f"Text document added successfully with {len(request.content)} characters")
-        return response
+        logger.info("Text document added successfully with %d characters", len(request.content))
+        return Response(content=TEXT_DOCUMENT_RESPONSE_ADAPTER.dump_json(response), media_type="application/json")
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error adding text document: {e}")
+        logger.error("Error adding text document: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@router.post("/pdfs", response_model=PDFUploadResponse)
-async def upload_pdfs(files: List[UploadFile] = File(...)) -> PDFUploadResponse:
+@router.post("/pdfs", responses={200: {"model": PDFUploadResponse}})
+async def upload_pdfs(files: List[UploadFile] = File(...), services: Services = Depends(services_dep)) -> Response:
     """Upload PDF files and extract text for the knowledge base."""
     try:
-        _, _, chroma_service = get_global_services()
+        _, _, chroma_service = services
         
         if not chroma_service or not chroma_service.is_available():
             raise HTTPException(status_code=503, detail="Knowledge base not available")
@@ -77,7 +80,7 @@ async def upload_pdfs(files: List[UploadFile] = File(...)) -> PDFUploadResponse:
             raise HTTPException(status_code=500, detail=result["error"])
         
         # Build response data
-        response_data = PDFUploadData(
+        response_data = PDFUploadData.model_construct(
             pdfs_processed=result["pdfs_processed"],
             pdfs_failed=result["pdfs_failed"],
             total_documents_added=result["total_documents_added"]
@@ -90,21 +93,21 @@ async def upload_pdfs(files: List[UploadFile] = File(...)) -> PDFUploadResponse:
             data=response_data
         )
         
-        logger.info(f"PDFs uploaded successfully: {result['pdfs_processed']} files processed")
-        return response
+        logger.info("PDFs uploaded successfully: %d files processed", result["pdfs_processed"])
+        return Response(content=PDF_UPLOAD_RESPONSE_ADAPTER.dump_json(response), media_type="application/json")
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error uploading PDFs: {e}")
+        logger.error("Error uploading PDFs: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@router.get("/", response_model=GetDocumentsResponse)
-async def get_documents() -> GetDocumentsResponse:
+@router.get("/", responses={200: {"model": GetDocumentsResponse}})
+async def get_documents(services: Services = Depends(services_dep)) -> Response:
     """Get all documents from the knowledge base."""
     try:
-        _, _, chroma_service = get_global_services()
+        _, _, chroma_service = services
         
         if not chroma_service or not chroma_service.is_available():
             raise HTTPException(status_code=503, detail="Knowledge base not available")
@@ -125,21 +128,21 @@ async def get_documents() -> GetDocumentsResponse:
             data=response_data
         )
         
-        logger.info(f"Retrieved {len(documents)} documents")
-        return response
+        logger.info("Retrieved %d documents", documents["document_count"])
+        return Response(content=GET_DOCUMENTS_RESPONSE_ADAPTER.dump_json(response), media_type="application/json")
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving documents: {e}")
+        logger.error("Error retrieving documents: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@router.delete("/", response_model=DeleteDocumentResponse)
-async def clear_knowledge_base() -> DeleteDocumentResponse:
+@router.delete("/", responses={200: {"model": DeleteDocumentResponse}})
+async def clear_knowledge_base(services: Services = Depends(services_dep)) -> Response:
     """Clear all data from the knowledge base."""
     try:
-        _, _, chroma_service = get_global_services()
+        _, _, chroma_service = services
         
         if not chroma_service or not chroma_service.is_available():
             raise HTTPException(status_code=503, detail="Knowledge base not available")
@@ -157,11 +160,11 @@ async def clear_knowledge_base() -> DeleteDocumentResponse:
             data=None
         )
         
-        logger.info(f"Knowledge base cleared successfully: {result.get('documents_removed', 0)} documents removed")
-        return response
+        logger.info("Knowledge base cleared successfully: %d documents removed", result.get("documents_removed", 0))
+        return Response(content=DELETE_DOCUMENT_RESPONSE_ADAPTER.dump_json(response), media_type="application/json")
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error clearing knowledge base: {e}")
+        logger.error("Error clearing knowledge base: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -2,62 +2,46 @@
 Health check API endpoints for the AI Student Support Service.
 """
 from typing import Dict, Any
-from fastapi import APIRouter, HTTPException
-from app.models.health import HealthResponse, HealthData
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import Response
+from app.models.health import HealthResponse, HealthData, HEALTH_RESPONSE_ADAPTER
 from app.utils.logger import get_logger
-from app.utils.service_manager import get_global_services
+from app.utils.service_manager import Services, services_dep
+from app.utils.service_utils import probe_services_status
 
 logger = get_logger(__name__)
 router = APIRouter()
 
 
-@router.get("/", response_model=HealthResponse)
-async def health_check() -> HealthResponse:
+@router.get("/", responses={200: {"model": HealthResponse}})
+async def health_check(services: Services = Depends(services_dep)) -> Response:
     """Comprehensive health check for all services."""
     try:
-        ai_service, rag_service, chroma_service = get_global_services()
+        ai_service, rag_service, chroma_service = services
+        
+        # Probe all services concurrently
+        service_statuses = await probe_services_status({
+            "ai_service": ai_service,
+            "rag_service": rag_service,
+            "chroma_service": chroma_service
+        })
+        
+        statuses = [service_status.get("status") for service_status in service_statuses.values()]
+        if "error" in statuses:
+            overall_status = "unhealthy"
+        elif any(status != "available" for status in statuses):
+            overall_status = "degraded"
+        else:
+            overall_status = "healthy"
         
         health_status = {
-            "overall_status": "healthy",
+            "overall_status": overall_status,
             "timestamp": None,
-            "services": {}
+            "services": service_statuses
         }
         
-        # Check AI service health
-        if ai_service and hasattr(ai_service, 'get_status'):
-            try:
-                ai_status = ai_service.get_status()
-                health_status["services"]["ai_service"] = ai_status
-                if ai_status.get("status") != "available":
-                    health_status["overall_status"] = "degraded"
-            except Exception as e:
-                health_status["services"]["ai_service"] = {"status": "error", "error": str(e)}
-                health_status["overall_status"] = "unhealthy"
-        
-        # Check RAG service health
-        if rag_service and hasattr(rag_service, 'get_status'):
-            try:
-                rag_status = rag_service.get_status()
-                health_status["services"]["rag_service"] = rag_status
-                if rag_status.get("status") != "available":
-                    health_status["overall_status"] = "degraded"
-            except Exception as e:
-                health_status["services"]["rag_service"] = {"status": "error", "error": str(e)}
-                health_status["overall_status"] = "unhealthy"
-        
-        # Check ChromaDB service health
-        if chroma_service and hasattr(chroma_service, 'get_status'):
-            try:
-                chroma_status = chroma_service.get_status()
-                health_status["services"]["chroma_service"] = chroma_status
-                if chroma_status.get("status") != "available":
-                    health_status["overall_status"] = "degraded"
-            except Exception as e:
-                health_status["services"]["chroma_service"] = {"status": "error", "error": str(e)}
-                health_status["overall_status"] = "unhealthy"
-        
         # Build response data
-        response_data = HealthData(
+        response_data = HealthData.model_construct(
             status=health_status["overall_status"],
             services=health_status["services"],
             timestamp=health_status["timestamp"],
@@ -71,9 +55,9 @@ async def health_check() -> HealthResponse:
             data=response_data
         )
         
-        logger.info(f"Health check completed - overall status: {health_status['overall_status']}")
-        return response
+        logger.info("Health check completed - overall status: %s", health_status["overall_status"])
+        return Response(content=HEALTH_RESPONSE_ADAPTER.dump_json(response), media_type="application/json")
         
     except Exception as e:
-        logger.error(f"Error in health check: {e}")
+        logger.error("Error in health check: %s", e)
         raise HTTPException(status_code=500, detail="Health check failed")
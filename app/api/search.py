@@ -2,36 +2,45 @@
 Search API endpoints for the AI Student Support Service.
 """
 from typing import List, Dict, Any
-from fastapi import APIRouter, HTTPException
-from app.models.search import SearchRequest, SearchResponse, SearchData
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import Response
+from app.models.search import SearchRequest, SearchResponse, SearchData, SearchDataColumnar, SEARCH_RESPONSE_ADAPTER
+from app.services.chroma_service import columns_to_documents
 from app.utils.logger import get_logger
-from app.utils.service_manager import get_global_services
+from app.utils.service_manager import Services, services_dep
 
 logger = get_logger(__name__)
 router = APIRouter()
 
 
-@router.post("/", response_model=SearchResponse)
-async def search_documents(request: SearchRequest) -> SearchResponse:
+@router.post("/", responses={200: {"model": SearchResponse}})
+async def search_documents(request: SearchRequest, services: Services = Depends(services_dep)) -> Response:
     """Search for documents using semantic similarity."""
     try:
-        _, _, chroma_service = get_global_services()
+        _, _, chroma_service = services
         
         if not chroma_service or not chroma_service.is_available():
             raise HTTPException(status_code=503, detail="Knowledge base not available")
         
-        # Perform semantic search
-        results = await chroma_service.search_documents(
-            query=request.query,
-            n_results=request.n_results
-        )
+        # Perform semantic search (repeated queries are served from the in-process caches)
+        columns = await chroma_service.search_columns(request.query, request.n_results)
+        
+        results_count = len(columns["document_ids"])
         
         # Build response data
-        response_data = SearchData(
-            query=request.query,
-            results_count=len(results),
-            documents=results
-        )
+        if request.columnar:
+            # Columns come straight from ChromaDB; skip per-row model construction
+            response_data = SearchDataColumnar.model_construct(
+                query=request.query,
+                results_count=results_count,
+                **columns
+            )
+        else:
+            response_data = SearchData.model_construct(
+                query=request.query,
+                results_count=results_count,
+                documents=columns_to_documents(columns)
+            )
         
         # Build standardized response
         response = SearchResponse(
@@ -40,11 +49,12 @@ async def search_documents(request: SearchRequest) -> SearchResponse:
             data=response_data
         )
         
-        logger.info(f"Search completed for query: '{request.query}' - {len(results)} results")
-        return response
+        logger.info("Search completed for query: '%s' - %d results", request.query, results_count)
+        
+        return Response(content=SEARCH_RESPONSE_ADAPTER.dump_json(response), media_type="application/json")
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error in search endpoint: {e}")
+        logger.error("Error in search endpoint: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
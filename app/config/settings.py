@@ -2,7 +2,10 @@
 Configuration settings for the AI Student Support Service.
 """
 import os
-from typing import Optional, List
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from operator import attrgetter
+from typing import Literal, Optional, Tuple
 from pydantic_settings import BaseSettings
 from pydantic import Field
 from dotenv import load_dotenv
@@ -11,6 +14,18 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+@dataclass(frozen=True, slots=True)
+class ModelSpec:
+    """Immutable configuration for one configured DeepSeek model slot."""
+    
+    name: str
+    api_key: str
+    api_url: str
+    model: str
+    provider: str
+    priority: int
+
+
 class Settings(BaseSettings):
     """Application settings."""
     
@@ -26,6 +41,9 @@ class Settings(BaseSettings):
     max_retries: int = Field(default=3, env="MAX_RETRIES")
     retry_delay: float = Field(default=1.0, env="RETRY_DELAY")
     
+    # Chat Configuration
+    max_chat_history: int = Field(default=16, ge=1, env="MAX_CHAT_HISTORY")  # Most recent messages forwarded to the LLM
+    
     # Hugging Face Configuration
     huggingface_token: Optional[str] = Field(default=None, env="HUGGINGFACE_TOKEN")  # Added for Hugging Face authentication
     
@@ -35,9 +53,26 @@ class Settings(BaseSettings):
     chroma_persist_directory: str = Field(default="./chroma_db", env="CHROMA_PERSIST_DIRECTORY")
     chroma_collection_name: str = Field(default="business_analysis_school", env="CHROMA_COLLECTION_NAME")
     
+    # ChromaDB HNSW index configuration (applied when the collection is created)
+    chroma_hnsw_space: str = Field(default="cosine", env="CHROMA_HNSW_SPACE")
+    chroma_hnsw_m: int = Field(default=16, env="CHROMA_HNSW_M")
+    chroma_hnsw_construction_ef: int = Field(default=200, env="CHROMA_HNSW_CONSTRUCTION_EF")
+    chroma_hnsw_search_ef: int = Field(default=64, env="CHROMA_HNSW_SEARCH_EF")
+    chroma_add_batch_size: int = Field(default=1000, ge=1, env="CHROMA_ADD_BATCH_SIZE")  # Chunks per collection.add call
+    
     # Embedding Model Configuration
     embedding_model: str = Field(default="all-MiniLM-L6-v2", env="EMBEDDING_MODEL")
     similarity_threshold: float = Field(default=0.6, env="SIMILARITY_THRESHOLD")
+    semantic_cache_enabled: bool = Field(default=False, env="SEMANTIC_CACHE_ENABLED")  # Reuse results of near-duplicate queries
+    semantic_cache_threshold: float = Field(default=0.97, ge=0.0, le=1.0, env="SEMANTIC_CACHE_THRESHOLD")  # Minimum query cosine similarity
+    cag_max_chunks: int = Field(default=0, ge=0, le=128, env="CAG_MAX_CHUNKS")  # Pass the whole KB to the LLM at or below this many chunks (0 disables, max 128)
+    embedding_backend: str = Field(default="torch", env="EMBEDDING_BACKEND")  # "torch" or "onnx" (int8 ONNX Runtime)
+    embedding_batch_size: int = Field(default=64, ge=1, env="EMBEDDING_BATCH_SIZE")  # Texts encoded per forward pass
+    embedding_precision: Literal["fp32", "fp16", "int8"] = Field(default="fp32", env="EMBEDDING_PRECISION")  # Torch backend: "fp32", "fp16" (GPU) or "int8" (dynamic quantization)
+    embedding_cache_precision: str = Field(default="float16", env="EMBEDDING_CACHE_PRECISION")  # On-disk embedding cache dtype: "float16" or "float32"
+    preload_embedding_model: bool = Field(default=False, env="PRELOAD_EMBEDDING_MODEL")  # Load at import time so pre-fork servers share weights
+    query_embedding_backend: str = Field(default="model", env="QUERY_EMBEDDING_BACKEND")  # "model" (same as documents) or "static"
+    static_embedding_model: str = Field(default="", env="STATIC_EMBEDDING_MODEL")  # Model2Vec directory or Hub id distilled from EMBEDDING_MODEL
     
     # Document Chunking Configuration
     chunk_size: int = Field(default=1000, env="CHUNK_SIZE")
@@ -47,38 +82,39 @@ class Settings(BaseSettings):
     host: str = Field(default="0.0.0.0", env="HOST")
     port: int = Field(default=8000, env="PORT")
     debug: bool = Field(default=False, env="DEBUG")
+    workers: int = Field(default=1, ge=1, env="WORKERS")  # Uvicorn worker processes; each holds its own model and ChromaDB client
+    limit_concurrency: int = Field(default=0, ge=0, env="LIMIT_CONCURRENCY")  # Per-worker cap on in-flight connections before 503s (0 disables)
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
+    include_openapi_examples: bool = Field(default=True, env="INCLUDE_OPENAPI_EXAMPLES")
+    worker_threads: int = Field(default=0, ge=0, env="WORKER_THREADS")  # Threads for blocking calls (to_thread, sync endpoints); 0 keeps library defaults
     
-    def get_available_models(self) -> List[dict]:
-        """Get list of available DeepSeek models with their configurations."""
-        models = []
-        
-        # Primary DeepSeek
-        if self.deepseek_api_key:
-            models.append({
-                "name": "deepseek_primary",
-                "api_key": self.deepseek_api_key,
-                "api_url": self.deepseek_api_url,
-                "model": self.deepseek_model,
-                "provider": "deepseek",
-                "priority": 1
-            })
-        
-        # Secondary DeepSeek
-        if self.deepseek_api_key_2:
-            models.append({
-                "name": "deepseek_secondary",
-                "api_key": self.deepseek_api_key_2,
-                "api_url": self.deepseek_api_url,
-                "model": self.deepseek_model_2,
-                "provider": "deepseek",
-                "priority": 2
-            })
+    @cached_property
+    def available_models(self) -> Tuple[ModelSpec, ...]:
+        """DeepSeek models with a configured API key, sorted by priority. Built once per settings object."""
+        slots = (
+            ("deepseek_primary", self.deepseek_api_key, self.deepseek_model, 1),
+            ("deepseek_secondary", self.deepseek_api_key_2, self.deepseek_model_2, 2),
+        )
         
-        return models
+        return tuple(sorted(
+            (
+                ModelSpec(
+                    name=name,
+                    api_key=api_key,
+                    api_url=self.deepseek_api_url,
+                    model=model,
+                    provider="deepseek",
+                    priority=priority
+                )
+                for name, api_key, model, priority in slots
+                if api_key
+            ),
+            key=attrgetter("priority")
+        ))
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get application settings."""
+    """Get application settings (built once per process)."""
     return Settings()
 
@@ -1,23 +1,32 @@
 """
 Base response models for standardized API responses.
+
+Endpoints serialize their response envelopes straight to JSON bytes on pydantic-core's Rust path,
+through each module's *_RESPONSE_ADAPTER (or model_dump_json), instead of having FastAPI re-validate
+them against a response_model.
 """
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 from pydantic import BaseModel, Field, ConfigDict
 
+from app.config.settings import get_settings
+
+
+def with_example(example: Dict[str, Any], **config: Any) -> ConfigDict:
+    """Build a model config, attaching the OpenAPI example only when examples are enabled."""
+    if get_settings().include_openapi_examples:
+        config["json_schema_extra"] = {"example": example}
+    return ConfigDict(**config)
+
 
 class ErrorResponse(BaseModel):
     """Standard error response model."""
     
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "success": False,
-                "message": "An error occurred",
-                "error": "Detailed error information",
-                "error_code": "VALIDATION_ERROR"
-            }
-        }
-    )
+    model_config = with_example({
+        "success": False,
+        "message": "An error occurred",
+        "error": "Detailed error information",
+        "error_code": "VALIDATION_ERROR"
+    })
     
     success: bool = Field(False, description="Always false for error responses")
     message: str = Field(..., description="Human-readable error message")
@@ -2,52 +2,48 @@
 Chat-related Pydantic models for the AI Student Support Service.
 """
 from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field
 
+from app.models.base import with_example
+from app.models.search import DocumentContext
 from app.models.status import ServicesStatusData, ServicesStatusResponse
 
 
 class ChatRequest(BaseModel):
     """Request model for chat endpoint."""
     
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "message": "What are the admission requirements for the Business Analysis program?",
-                "chat_history": [
-                    {"role": "user", "content": "Hello, I'm interested in your programs"},
-                    {"role": "assistant", "content": "Hello! I'd be happy to help you learn about our programs."}
-                ]
-            }
-        }
-    )
+    model_config = with_example({
+        "message": "What are the admission requirements for the Business Analysis program?",
+        "chat_history": [
+            {"role": "user", "content": "Hello, I'm interested in your programs"},
+            {"role": "assistant", "content": "Hello! I'd be happy to help you learn about our programs."}
+        ],
+        "include_context": False
+    })
     
     message: str = Field(..., description="User's message or question")
     chat_history: List[Dict[str, str]] = Field(default=[], description="Previous chat messages")
+    include_context: bool = Field(default=False, description="Include retrieved RAG document previews and scores in the response metadata")
 
 
 class ChatData(BaseModel):
-    """Chat response data model."""
+    """Chat response data model. Built with model_construct from the AI service's typed result."""
     
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "response": "The admission requirements for our Business Analysis program include...",
-                "confidence_score": 0.85,
-                "escalated": False,
-                "escalation_reason": None,
-                "context_used": ["Document 1", "Document 2"],
-                "metadata": {
-                    "llm_used": "deepseek",
-                    "message_type": "question",
-                    "rag_documents_count": 2,
-                    "rag_scores": [0.92, 0.87],
-                    "rag_documents": ["Business Analysis is the practice of...", "Our program covers..."],
-                    "escalation_message": None
-                }
-            }
+    model_config = with_example({
+        "response": "The admission requirements for our Business Analysis program include...",
+        "confidence_score": 0.85,
+        "escalated": False,
+        "escalation_reason": None,
+        "context_used": ["Document 1", "Document 2"],
+        "metadata": {
+            "llm_used": "deepseek",
+            "message_type": "question",
+            "rag_documents_count": 2,
+            "rag_scores": [0.92, 0.87],
+            "rag_documents": ["Business Analysis is the practice of...", "Our program covers..."],
+            "escalation_message": None
         }
-    )
+    }, extra="forbid", frozen=True)
     
     response: str = Field(..., description="AI-generated response")
     confidence_score: float = Field(..., description="Confidence score of the response (0.0 to 1.0)")
@@ -58,54 +54,28 @@ class ChatData(BaseModel):
 
 
 class ChatResponse(BaseModel):
-    """Response model for chat endpoint."""
+    """Response model for chat endpoint. Built with model_construct from known-good data."""
     
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "success": True,
-                "message": "Chat response generated successfully",
-                "data": {
-                    "response": "The admission requirements for our Business Analysis program include...",
-                    "confidence_score": 0.85,
-                    "escalated": False,
-                    "escalation_reason": None,
-                    "context_used": ["Document 1", "Document 2"],
-                    "metadata": {
-                        "llm_used": "deepseek",
-                        "message_type": "question",
-                        "rag_documents_count": 2,
-                        "rag_scores": [0.92, 0.87],
-                        "rag_documents": ["Business Analysis is the practice of...", "Our program covers..."],
-                        "escalation_message": None
-                    }
-                }
+    model_config = with_example({
+        "success": True,
+        "message": "Chat response generated successfully",
+        "data": {
+            "response": "The admission requirements for our Business Analysis program include...",
+            "confidence_score": 0.85,
+            "escalated": False,
+            "escalation_reason": None,
+            "context_used": ["Document 1", "Document 2"],
+            "metadata": {
+                "llm_used": "deepseek",
+                "message_type": "question",
+                "rag_documents_count": 2,
+                "rag_scores": [0.92, 0.87],
+                "rag_documents": ["Business Analysis is the practice of...", "Our program covers..."],
+                "escalation_message": None
             }
         }
-    )
+    }, extra="forbid", frozen=True)
     
     success: bool = Field(True, description="Always true for success responses")
     message: str = Field(..., description="Success message")
     data: ChatData = Field(..., description="Chat response data")
-
-
-class DocumentContext(BaseModel):
-    """Model for document context in search results."""
-    
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "document_id": "doc_123",
-                "title": "Business Analysis Fundamentals",
-                "content": "Business analysis is the practice of...",
-                "similarity_score": 0.92,
-                "source": "course_materials.pdf"
-            }
-        }
-    )
-    
-    document_id: str = Field(..., description="Unique document identifier")
-    title: str = Field(..., description="Document title or name")
-    content: str = Field(..., description="Document content or excerpt")
-    similarity_score: float = Field(..., description="Similarity score (0.0 to 1.0)")
-    source: str = Field(..., description="Document source or filename")
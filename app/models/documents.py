@@ -2,19 +2,18 @@
 Document management Pydantic models for the AI Student Support Service.
 """
 from typing import List, Optional
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter
+from typing_extensions import Annotated, TypedDict
+
+from app.models.base import with_example
 
 
 class TextDocumentRequest(BaseModel):
     """Request model for adding text documents."""
     
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "content": "Business Analysis is the practice of enabling change in an organizational context..."
-            }
-        }
-    )
+    model_config = with_example({
+        "content": "Business Analysis is the practice of enabling change in an organizational context..."
+    })
     
     content: str = Field(..., description="Document text content")
 
@@ -22,100 +21,72 @@ class TextDocumentRequest(BaseModel):
 class PDFUploadData(BaseModel):
     """PDF upload response data model."""
     
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "pdfs_processed": 2,
-                "pdfs_failed": 0,
-                "total_documents_added": 2
-            }
-        }
-    )
-    
+    model_config = ConfigDict(frozen=True)
+
     pdfs_processed: int = Field(..., description="Number of PDFs successfully processed")
     pdfs_failed: int = Field(..., description="Number of PDFs that failed processing")
     total_documents_added: int = Field(..., description="Total number of documents added to knowledge base")
 
 
-class PDFUploadResponse(BaseModel):
+class PDFUploadResponse(TypedDict):
     """Response model for PDF upload operations."""
     
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "success": True,
-                "message": "Successfully processed 2 PDF documents",
-                "data": {
-                    "pdfs_processed": 2,
-                    "pdfs_failed": 0,
-                    "total_documents_added": 2
-                }
-            }
+    __pydantic_config__ = with_example({
+        "success": True,
+        "message": "Successfully processed 2 PDF documents",
+        "data": {
+            "pdfs_processed": 2,
+            "pdfs_failed": 0,
+            "total_documents_added": 2
         }
-    )
+    })
     
-    success: bool = Field(True, description="Always true for success responses")
-    message: str = Field(..., description="Success message")
-    data: PDFUploadData = Field(..., description="PDF upload results")
+    success: Annotated[bool, Field(description="Always true for success responses")]
+    message: Annotated[str, Field(description="Success message")]
+    data: Annotated[PDFUploadData, Field(description="PDF upload results")]
+
+
+PDF_UPLOAD_RESPONSE_ADAPTER = TypeAdapter(PDFUploadResponse)
 
 
 class TextDocumentData(BaseModel):
     """Text document response data model."""
     
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "document_id": "doc_123",
-                "content_length": 1250,
-                "message": "Document processed successfully"
-            }
-        }
-    )
-    
+    model_config = ConfigDict(frozen=True)
+
     document_id: str = Field(..., description="Unique document identifier")
     content_length: int = Field(..., description="Length of document content in characters")
     message: str = Field(..., description="Processing status message")
 
 
-class TextDocumentResponse(BaseModel):
+class TextDocumentResponse(TypedDict):
     """Response model for text document operations."""
     
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "success": True,
-                "message": "Text document added successfully",
-                "data": {
-                    "document_id": "doc_123",
-                    "title": "Business Analysis Fundamentals",
-                    "content_length": 1250,
-                    "source": "course_materials",
-                    "tags": ["fundamentals", "business-analysis"]
-                }
-            }
+    __pydantic_config__ = with_example({
+        "success": True,
+        "message": "Text document added successfully",
+        "data": {
+            "document_id": "doc_123",
+            "title": "Business Analysis Fundamentals",
+            "content_length": 1250,
+            "source": "course_materials",
+            "tags": ["fundamentals", "business-analysis"]
         }
-    )
+    })
     
-    success: bool = Field(True, description="Always true for success responses")
-    message: str = Field(..., description="Success message")
-    data: TextDocumentData = Field(..., description="Text document information")
+    success: Annotated[bool, Field(description="Always true for success responses")]
+    message: Annotated[str, Field(description="Success message")]
+    data: Annotated[TextDocumentData, Field(description="Text document information")]
+
+
+TEXT_DOCUMENT_RESPONSE_ADAPTER = TypeAdapter(TextDocumentResponse)
 
 
 class KnowledgeBaseInfo(BaseModel):
     """Knowledge base information data model."""
     
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "collection_name": "business_analysis_kb",
-                "document_count": 150,
-                "embedding_model": "all-MiniLM-L6-v2",
-                "similarity_threshold": 0.7,
-                "status": "available"
-            }
-        }
-    )
-    
+    model_config = ConfigDict(frozen=True)
+
     collection_name: str = Field(..., description="Name of the ChromaDB collection")
     document_count: int = Field(..., description="Total number of documents in the collection")
     embedding_model: str = Field(..., description="Name of the embedding model being used")
@@ -126,65 +97,50 @@ class KnowledgeBaseInfo(BaseModel):
 class GetDocumentsData(BaseModel):
     """Get documents response data model."""
     
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "knowledge_base_info": {
-                    "collection_name": "business_analysis_kb",
-                    "document_count": 150,
-                    "embedding_model": "all-MiniLM-L6-v2",
-                    "similarity_threshold": 0.7,
-                    "status": "available"
-                },
-                "document_count": 150
-            }
-        }
-    )
-    
+    model_config = ConfigDict(frozen=True)
+
     knowledge_base_info: KnowledgeBaseInfo = Field(..., description="Knowledge base information")
     document_count: int = Field(..., description="Total number of documents")
 
 
-class GetDocumentsResponse(BaseModel):
+class GetDocumentsResponse(TypedDict):
     """Response model for getting documents information."""
     
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "success": True,
-                "message": "Knowledge base information retrieved successfully",
-                "data": {
-                    "knowledge_base_info": {
-                        "collection_name": "business_analysis_kb",
-                        "document_count": 150,
-                        "embedding_model": "all-MiniLM-L6-v2",
-                        "similarity_threshold": 0.7,
-                        "status": "available"
-                    },
-                    "document_count": 150
-                }
-            }
+    __pydantic_config__ = with_example({
+        "success": True,
+        "message": "Knowledge base information retrieved successfully",
+        "data": {
+            "knowledge_base_info": {
+                "collection_name": "business_analysis_kb",
+                "document_count": 150,
+                "embedding_model": "all-MiniLM-L6-v2",
+                "similarity_threshold": 0.7,
+                "status": "available"
+            },
+            "document_count": 150
         }
-    )
+    })
     
-    success: bool = Field(True, description="Always true for success responses")
-    message: str = Field(..., description="Success message")
-    data: GetDocumentsData = Field(..., description="Knowledge base information")
+    success: Annotated[bool, Field(description="Always true for success responses")]
+    message: Annotated[str, Field(description="Success message")]
+    data: Annotated[GetDocumentsData, Field(description="Knowledge base information")]
+
 
+GET_DOCUMENTS_RESPONSE_ADAPTER = TypeAdapter(GetDocumentsResponse)
 
-class DeleteDocumentResponse(BaseModel):
+
+class DeleteDocumentResponse(TypedDict):
     """Response model for document deletion operations."""
     
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "success": True,
-                "message": "Document 123 deleted successfully",
-                "data": None
-            }
-        }
-    )
+    __pydantic_config__ = with_example({
+        "success": True,
+        "message": "Document 123 deleted successfully",
+        "data": None
+    })
     
-    success: bool = Field(True, description="Always true for success responses")
-    message: str = Field(..., description="Success message")
-    data: None = Field(None, description="No data for deletion operations")
+    success: Annotated[bool, Field(description="Always true for success responses")]
+    message: Annotated[str, Field(description="Success message")]
+    data: Annotated[None, Field(description="No data for deletion operations")]
+
+
+DELETE_DOCUMENT_RESPONSE_ADAPTER = TypeAdapter(DeleteDocumentResponse)
@@ -1,79 +1,93 @@
 """
 Search-related Pydantic models for the AI Student Support Service.
 """
-from typing import List
-from pydantic import BaseModel, Field, ConfigDict
+from typing import List, Union
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter
+from typing_extensions import Annotated, TypedDict
 
-from app.models.chat import DocumentContext
+from app.models.base import with_example
+
+
+class DocumentContext(BaseModel):
+    """Model for document context in search results."""
+    
+    model_config = with_example({
+        "document_id": "doc_123",
+        "title": "Business Analysis Fundamentals",
+        "content": "Business analysis is the practice of...",
+        "similarity_score": 0.92,
+        "source": "course_materials.pdf"
+    }, extra="forbid", frozen=True)
+    
+    document_id: str = Field(..., description="Unique document identifier")
+    title: str = Field(..., description="Document title or name")
+    content: str = Field(..., description="Document content or excerpt")
+    similarity_score: float = Field(..., description="Similarity score (0.0 to 1.0)")
+    source: str = Field(..., description="Document source or filename")
 
 
 class SearchRequest(BaseModel):
     """Request model for search endpoint."""
     
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "query": "Business Analysis certification requirements",
-                "n_results": 5
-            }
-        }
-    )
+    model_config = with_example({
+        "query": "Business Analysis certification requirements",
+        "n_results": 5,
+        "columnar": False
+    })
     
     query: str = Field(..., description="Search query text")
     n_results: int = Field(default=5, description="Number of results to return", ge=1, le=20)
+    columnar: bool = Field(default=False, description="Return results as parallel column lists instead of document objects")
 
 
 class SearchData(BaseModel):
     """Search response data model."""
     
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "query": "Business Analysis certification requirements",
-                "results_count": 3,
-                "documents": [
-                    {
-                        "document_id": "doc_123",
-                        "title": "Certification Requirements",
-                        "content": "To obtain Business Analysis certification...",
-                        "similarity_score": 0.92,
-                        "source": "certification_guide.pdf"
-                    }
-                ]
-            }
-        }
-    )
+    model_config = ConfigDict(extra="forbid", frozen=True)
     
     query: str = Field(..., description="Original search query")
     results_count: int = Field(..., description="Number of documents found")
     documents: List[DocumentContext] = Field(..., description="List of relevant documents")
 
 
-class SearchResponse(BaseModel):
+class SearchDataColumnar(BaseModel):
+    """Columnar search response data model, one list per document field."""
+    
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    
+    query: str = Field(..., description="Original search query")
+    results_count: int = Field(..., description="Number of documents found")
+    document_ids: List[str] = Field(..., description="Unique document identifiers")
+    titles: List[str] = Field(..., description="Document titles or names")
+    contents: List[str] = Field(..., description="Document contents or excerpts")
+    similarity_scores: List[float] = Field(..., description="Similarity scores (0.0 to 1.0)")
+    sources: List[str] = Field(..., description="Document sources or filenames")
+
+
+class SearchResponse(TypedDict):
     """Response model for search endpoint."""
     
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "success": True,
-                "message": "Search completed successfully",
-                "data": {
-                    "query": "Business Analysis certification requirements",
-                    "results_count": 3,
-                    "documents": [
-                        {
-                            "document_id": "doc_123",
-                            "title": "Certification Requirements",
-                            "content": "To obtain Business Analysis certification...",
-                            "similarity_score": 0.92,
-                            "source": "certification_guide.pdf"
-                        }
-                    ]
+    __pydantic_config__ = with_example({
+        "success": True,
+        "message": "Search completed successfully",
+        "data": {
+            "query": "Business Analysis certification requirements",
+            "results_count": 3,
+            "documents": [
+                {
+                    "document_id": "doc_123",
+                    "title": "Certification Requirements",
+                    "content": "To obtain Business Analysis certification...",
+                    "similarity_score": 0.92,
+                    "source": "certification_guide.pdf"
                 }
-            }
+            ]
         }
-    )
+    })
     
-    success: bool = Field(True, description="Always true for success responses")
-    message: str = Field(..., description="Success message")
-    data: SearchData = Field(..., description="Search results data")
+    success: Annotated[bool, Field(description="Always true for success responses")]
+    message: Annotated[str, Field(description="Success message")]
+    data: Annotated[Union[SearchData, SearchDataColumnar], Field(description="Search results data")]
+
+
+SEARCH_RESPONSE_ADAPTER = TypeAdapter(SearchResponse)
@@ -64,15 +64,15 @@ When providing answers, ensure that each message is clear, relevant, and adds va
 
 
 
-# Function to get the main system prompt with RAG context
-def get_main_system_prompt(rag_context: str = "No relevant documents found") -> str:
-    """
-    Get the main system prompt with RAG context.
-    
-    Args:
-        rag_context: Context from RAG service
-        
-    Returns:
-        Formatted system prompt
-    """
-    return MAIN_SYSTEM_PROMPT.format(rag_context=rag_context)
+# Context used when retrieval finds nothing
+NO_DOCUMENTS_CONTEXT = "No relevant documents found"
+
+# One block per retrieved document in the RAG context
+DOCUMENT_CONTEXT_TEMPLATE = "Document {index}: {title}\nSource: {source}\nRelevance Score: {score:.3f}\nContent: {content}\n---"
+
+# Pre-split around the single placeholder so each call is a plain concatenation
+# instead of a str.format() walk over the whole template
+SYSTEM_PROMPT_PREFIX, SYSTEM_PROMPT_SUFFIX = (
+    part.replace("{{", "{").replace("}}", "}")
+    for part in MAIN_SYSTEM_PROMPT.split("{rag_context}")
+)
@@ -1 +1,6 @@
-"""Services package"""
+"""Services package
+
+Service modules pull in heavy stacks at import time (chromadb, sentence-transformers, the HTTP client).
+Callers that only need the types import them under TYPE_CHECKING, and constructors import the
+classes inside the function that builds them, so loading a caller stays cheap.
+"""
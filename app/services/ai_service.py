@@ -2,102 +2,289 @@
 AI service for the AI Student Support Service.
 Uses DeepSeek AI for LLM operations with intelligent escalation.
 """
-from typing import Dict, Any, Optional, List
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Any, Optional, List, Tuple
 from app.config.settings import get_settings
-from app.services.rag_service import RAGService
-from app.services.deepseek_service import EnhancedDeepSeekService
-from app.prompts.ai_prompts import get_main_system_prompt
+from app.prompts.ai_prompts import (
+    DOCUMENT_CONTEXT_TEMPLATE, NO_DOCUMENTS_CONTEXT, SYSTEM_PROMPT_PREFIX, SYSTEM_PROMPT_SUFFIX
+)
 from app.utils.logger import get_logger
 import json
+import re
+import time
+import orjson
+from copy import copy
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+
+if TYPE_CHECKING:
+    from app.services.deepseek_service import EnhancedDeepSeekService
+    from app.services.rag_service import RAGService
 
 logger = get_logger(__name__)
 settings = get_settings()
 
+# Used when the model returns an envelope without a response
+DEFAULT_RESPONSE_TEXT = "Sorry, I couldn't generate a response."
+
+# Seconds a DeepSeek availability probe result is reused
+AVAILABILITY_TTL_SECONDS = 5.0
+
+# Characters of each retrieved document kept in the response preview
+RAG_PREVIEW_LENGTH = 200
+
+# Fields the model is asked to return in its JSON envelope
+ENVELOPE_FIELDS = (
+    "response", "confidence", "escalated",
+    "escalation_reason", "message_type", "escalation_message"
+)
+_ENVELOPE_DEFAULTS = dict.fromkeys(ENVELOPE_FIELDS)
+
+
+@dataclass(slots=True)
+class AIResult:
+    """Result of a single AI chat turn."""
+    
+    response: str
+    confidence: float
+    escalated: bool
+    escalation_reason: Optional[str] = None
+    message_type: str = "other"
+    escalation_message: Optional[str] = None
+    rag_documents: List[str] = field(default_factory=list)
+    rag_scores: List[float] = field(default_factory=list)
+    llm_used: str = "none"
+
+
+# Prebuilt escalation results for degraded deployments; handed out as shallow copies
+_AI_UNAVAILABLE = AIResult(
+    response="I'm currently experiencing technical difficulties. Please try again later.",
+    confidence=0.0,
+    escalated=True,
+    escalation_reason="AI service unavailable"
+)
+_RAG_UNAVAILABLE = AIResult(
+    response="Knowledge base service not available. Please try again later.",
+    confidence=0.0,
+    escalated=True,
+    escalation_reason="RAG service unavailable"
+)
+_PROCESSING_ERROR = AIResult(
+    response="I encountered an error processing your request. Please try again.",
+    confidence=0.0,
+    escalated=True
+)
+
+
+@lru_cache(maxsize=1)
+def _get_deepseek_service() -> "EnhancedDeepSeekService":
+    """Process-wide DeepSeek service so its HTTP connection pools stay warm across AIService instances."""
+    from app.services.deepseek_service import EnhancedDeepSeekService
+    return EnhancedDeepSeekService()
+
+
+def _coerce_confidence(value: Any) -> float:
+    """Coerce a model-supplied confidence to a float, defaulting to 0.0."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _optional_str(value: Any) -> Optional[str]:
+    """Coerce a model-supplied optional field to str, keeping None."""
+    return None if value is None else str(value)
+
+
+class ResponseFieldStreamer:
+    """Incrementally extracts the "response" string value from a streamed JSON envelope."""
+    
+    _FIELD_PATTERN = re.compile(r'"response"\s*:\s*"')
+    
+    def __init__(self) -> None:
+        """Initialize streamer state."""
+        self._buffer = ""
+        self._started = False
+        self._done = False
+        self._escape: Optional[str] = None
+    
+    def feed(self, text: str) -> str:
+        """Consume a raw chunk of model output. Returns newly decoded response text."""
+        if self._done:
+            return ""
+        
+        if not self._started:
+            self._buffer += text
+            match = self._FIELD_PATTERN.search(self._buffer)
+            if not match:
+                return ""
+            self._started = True
+            text = self._buffer[match.end():]
+            self._buffer = ""
+        
+        decoded = []
+        for char in text:
+            if self._escape is not None:
+                self._escape += char
+                # Wait for the full \uXXXX sequence (or a surrogate pair)
+                if self._escape[1] == "u":
+                    if len(self._escape) < 6:
+                        continue
+                    if 0xD800 <= int(self._escape[2:6], 16) <= 0xDBFF and len(self._escape) < 12:
+                        continue
+                try:
+                    decoded.append(json.loads(f'"{self._escape}"'))
+                except ValueError:
+                    pass
+                self._escape = None
+            elif char == "\\":
+                self._escape = char
+            elif char == '"':
+                self._done = True
+                break
+            else:
+                decoded.append(char)
+        
+        return "".join(decoded)
+
 
 class AIService:
     """AI service for LLM operations using DeepSeek with intelligent escalation."""
     
     def __init__(self) -> None:
         """Initialize AI service with enhanced DeepSeek and RAG services."""
-        self.enhanced_deepseek_service = EnhancedDeepSeekService()
+        self.enhanced_deepseek_service = _get_deepseek_service()
         self.rag_service = None  # Will be set later
+        self._models_configured = len(settings.available_models)  # Static for the process lifetime
+        self._available = False
+        self._available_at = float("-inf")
         
         logger.info(f"AI Service initialized - Enhanced DeepSeek: {self.enhanced_deepseek_service.is_available()}")
     
-    def set_rag_service(self, rag_service: RAGService) -> None:
+    def set_rag_service(self, rag_service: "RAGService") -> None:
         """Set RAG service reference."""
         self.rag_service = rag_service
         if self.rag_service:
             self.rag_service.set_ai_service(self)
     
     def is_available(self) -> bool:
-        """Check if AI service is available."""
-        return self.enhanced_deepseek_service.is_available()
+        """Check if AI service is available. The DeepSeek probe is cached for a few seconds."""
+        now = time.monotonic()
+        if now - self._available_at > AVAILABILITY_TTL_SECONDS:
+            self._available = self.enhanced_deepseek_service.is_available()
+            self._available_at = now
+        return self._available
+    
+    async def close(self) -> None:
+        """Release pooled HTTP connections to the LLM provider."""
+        await self.enhanced_deepseek_service.close()
     
     def get_status(self) -> Dict[str, Any]:
         """Get comprehensive service status information."""
+        available = self.is_available()
         return {
-            "status": "available" if self.is_available() else "unavailable",
-            "enhanced_deepseek_available": self.enhanced_deepseek_service.is_available(),
+            "status": "available" if available else "unavailable",
+            "enhanced_deepseek_available": available,
             "rag_service_available": self.rag_service is not None and self.rag_service.is_available(),
-            "models_configured": len(settings.get_available_models()),
-            "error": None if self.is_available() else "Enhanced DeepSeek service not available"
+            "models_configured": self._models_configured,
+            "error": None if available else "Enhanced DeepSeek service not available"
         }
     
+    def _check_availability(self) -> Optional[AIResult]:
+        """Return an escalated response if the AI or RAG service is unavailable, else None."""
+        if not self.is_available():
+            return copy(_AI_UNAVAILABLE)
+        
+        if not self.rag_service:
+            return copy(_RAG_UNAVAILABLE)
+        
+        return None
+    
+    async def _prepare_chat(
+        self,
+        user_message: str,
+        chat_history: Optional[List[Dict[str, str]]]
+    ) -> Tuple[List[Dict[str, str]], str, List[str], List[float]]:
+        """Retrieve RAG context and build the messages and system prompt for the AI call."""
+        rag_results = await self.rag_service.retrieve_relevant_documents(user_message, n_results=5)
+        
+        # Prepare messages for AI call, keeping only the most recent chat history
+        history = chat_history[-settings.max_chat_history:] if chat_history else ()
+        messages = [*history, {"role": "user", "content": user_message}]
+        
+        # Build context, scores and previews in a single pass over the results
+        context_parts = []
+        rag_scores = []
+        rag_documents = []
+        for i, doc in enumerate(rag_results, 1):
+            content = doc.get("content", "")
+            score = doc.get("similarity_score", 0.0)
+            rag_scores.append(score)
+            rag_documents.append(
+                f"{content[:RAG_PREVIEW_LENGTH]}..." if len(content) > RAG_PREVIEW_LENGTH else content
+            )
+            context_parts.append(DOCUMENT_CONTEXT_TEMPLATE.format(
+                index=i,
+                title=doc.get("title", "Unknown Document"),
+                source=doc.get("source", "Unknown Source"),
+                score=score,
+                content=content
+            ))
+        rag_context = "\n".join(context_parts) if context_parts else NO_DOCUMENTS_CONTEXT
+        
+        # Splice the context into the pre-split system prompt
+        system_prompt = SYSTEM_PROMPT_PREFIX + rag_context + SYSTEM_PROMPT_SUFFIX
+        
+        return messages, system_prompt, rag_documents, rag_scores
+    
+    def _parse_ai_response(self, response: str, rag_documents: List[str], rag_scores: List[float]) -> AIResult:
+        """Parse the AI's JSON envelope, falling back to plain text if it isn't valid JSON."""
+        try:
+            ai_result = orjson.loads(response.strip())
+        except orjson.JSONDecodeError:
+            ai_result = None
+        
+        if not isinstance(ai_result, dict):
+            # Fallback if AI doesn't return a valid JSON object
+            return AIResult(
+                response=response.strip(),
+                confidence=0.7,
+                escalated=False,
+                rag_documents=rag_documents,
+                rag_scores=rag_scores,
+                llm_used="deepseek"
+            )
+        
+        # Fill missing fields in one dict merge; null fields fall back to defaults. Values are
+        # coerced here so the response models can be built with model_construct (no re-validation).
+        ai_result = {**_ENVELOPE_DEFAULTS, **ai_result}
+        return AIResult(
+            response=str(ai_result["response"] or DEFAULT_RESPONSE_TEXT),
+            confidence=_coerce_confidence(ai_result["confidence"]),
+            escalated=bool(ai_result["escalated"]),
+            escalation_reason=_optional_str(ai_result["escalation_reason"]),
+            message_type=str(ai_result["message_type"] or "other"),
+            escalation_message=_optional_str(ai_result["escalation_message"]),
+            rag_documents=rag_documents,
+            rag_scores=rag_scores,
+            llm_used="deepseek"
+        )
+    
+    def _error_response(self, error: Exception) -> AIResult:
+        """Build the escalated response returned when chat processing fails."""
+        return replace(_PROCESSING_ERROR, escalation_reason=f"Processing error: {error}")
+    
     async def chat_with_ai(
         self, 
         user_message: str, 
         chat_history: Optional[List[Dict[str, str]]] = None
-    ) -> Dict[str, Any]:
-        """Process user query in single AI call with RAG integration. Returns response dict."""
+    ) -> AIResult:
+        """Process user query in single AI call with RAG integration. Returns an AIResult."""
         try:
-            if not self.is_available():
-                return {
-                    "response": "I'm currently experiencing technical difficulties. Please try again later.",
-                    "confidence": 0.0,
-                    "escalated": True,
-                    "escalation_reason": "AI service unavailable",
-                    "rag_documents": [],
-                    "rag_scores": [],
-                    "llm_used": "none"
-                }
-            
-            # Get RAG results first
-            if not self.rag_service:
-                return {
-                    "response": "Knowledge base service not available. Please try again later.",
-                    "confidence": 0.0,
-                    "escalated": True,
-                    "escalation_reason": "RAG service unavailable",
-                    "rag_documents": [],
-                    "rag_scores": [],
-                    "llm_used": "none"
-                }
-            
-            # Get RAG results
-            rag_results = await self.rag_service.retrieve_relevant_documents(user_message, n_results=5)
-            
-            # Prepare context for AI
-            rag_context = ""
-            rag_scores = []
-            rag_documents = []
+            unavailable = self._check_availability()
+            if unavailable:
+                return unavailable
             
-            if rag_results:
-                rag_context = self.rag_service.build_context_from_documents(rag_results)
-                rag_scores = [doc.get("similarity_score", 0.0) for doc in rag_results]
-                rag_documents = [doc.get("content", "")[:200] + "..." for doc in rag_results]
-            
-            # Get system prompt from prompts file
-            system_prompt = get_main_system_prompt(rag_context if rag_context else "No relevant documents found")
-            
-            # Prepare messages for AI call, including chat history
-            messages = []
-            if chat_history:
-                # Add chat history in the correct format
-                messages.extend(chat_history)
-            
-            # Add current user message
-            messages.append({"role": "user", "content": user_message})
+            messages, system_prompt, rag_documents, rag_scores = await self._prepare_chat(user_message, chat_history)
 
             # Make single AI call with chat history
             response = await self.enhanced_deepseek_service.generate_response(
@@ -108,44 +295,42 @@ class AIService:
             )
             
             # Parse AI response
-            try:
-                ai_result = json.loads(response.strip())
-                
-                # Validate required fields
-                required_fields = ["response", "confidence", "escalated", "escalation_reason", "message_type", "escalation_message"]
-                for field in required_fields:
-                    if field not in ai_result:
-                        ai_result[field] = None
-                
-                # Add RAG data
-                ai_result["rag_documents"] = rag_documents
-                ai_result["rag_scores"] = rag_scores
-                ai_result["llm_used"] = "deepseek"
-                
-                return ai_result
-                
-            except json.JSONDecodeError:
-                # Fallback if AI doesn't return valid JSON
-                return {
-                    "response": response.strip(),
-                    "confidence": 0.7,
-                    "escalated": False,
-                    "escalation_reason": None,
-                    "message_type": "other",
-                    "escalation_message": None,
-                    "rag_documents": rag_documents,
-                    "rag_scores": rag_scores,
-                    "llm_used": "deepseek"
-                }
+            return self._parse_ai_response(response, rag_documents, rag_scores)
                 
         except Exception as e:
             logger.error(f"Error in chat processing: {e}")
-            return {
-                "response": "I encountered an error processing your request. Please try again.",
-                "confidence": 0.0,
-                "escalated": True,
-                "escalation_reason": f"Processing error: {str(e)}",
-                "rag_documents": [],
-                "rag_scores": [],
-                "llm_used": "none"
-            }
+            return self._error_response(e)
+    
+    async def chat_with_ai_stream(
+        self,
+        user_message: str,
+        chat_history: Optional[List[Dict[str, str]]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream the AI answer. Yields {"delta": str} events, then {"done": True, "result": AIResult}."""
+        try:
+            unavailable = self._check_availability()
+            if unavailable:
+                yield {"done": True, "result": unavailable}
+                return
+            
+            messages, system_prompt, rag_documents, rag_scores = await self._prepare_chat(user_message, chat_history)
+            
+            # Forward only the user-facing "response" text; the full envelope is parsed at the end
+            streamer = ResponseFieldStreamer()
+            raw_parts = []
+            async for chunk in self.enhanced_deepseek_service.generate_response_stream(
+                messages=messages,
+                system_prompt=system_prompt,
+                max_tokens=500,
+                temperature=0.7
+            ):
+                raw_parts.append(chunk)
+                delta = streamer.feed(chunk)
+                if delta:
+                    yield {"delta": delta}
+            
+            yield {"done": True, "result": self._parse_ai_response("".join(raw_parts), rag_documents, rag_scores)}
+            
+        except Exception as e:
+            logger.error(f"Error in streaming chat processing: {e}")
+            yield {"done": True, "result": self._error_response(e)}
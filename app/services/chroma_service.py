@@ -1,19 +1,103 @@
 """
 ChromaDB service for vector database operations and document management.
 """
+import asyncio
+import contextlib
 import os
 import hashlib
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Union
 from chromadb import PersistentClient, Collection
 from sentence_transformers import SentenceTransformer
 from app.config.settings import get_settings
-from app.models.chat import DocumentContext
+from app.models.search import DocumentContext
+from app.utils.embedding_cache import (
+    clear_result_cache, make_query_key, get_cached_embedding, set_cached_embedding,
+    get_cached_results, set_cached_results, remember_query_embedding, find_similar_query,
+    get_collection_version
+)
+from app.utils.embedding_store import open_embedding_store
 from app.utils.logger import get_logger
+from app.utils.onnx_embedder import ONNX_MODEL_CACHE_DIRECTORY, OnnxEmbeddingModel
+from app.utils.static_embedder import StaticEmbeddingModel
 from app.utils.text_chunker import TextChunker
 import uuid
+import numpy as np
 
 logger = get_logger(__name__)
 
+# Chunked documents buffered ahead of the embedding stage during bulk ingestion
+INGEST_QUEUE_DOCUMENTS = 8
+
+
+def columns_to_documents(columns: Dict[str, List[Any]]) -> List[DocumentContext]:
+    """Turn parallel search result columns into DocumentContext rows."""
+    # Columns come from our own collection, so rows skip re-validation
+    return [
+        DocumentContext.model_construct(
+            document_id=document_id,
+            title=title,
+            content=content,
+            similarity_score=similarity_score,
+            source=source
+        )
+        for document_id, title, content, similarity_score, source in zip(
+            columns["document_ids"], columns["titles"], columns["contents"],
+            columns["similarity_scores"], columns["sources"]
+        )
+    ]
+
+
+@lru_cache(maxsize=None)
+def load_embedding_model(
+    backend: str, model_name: str, cache_directory: str, token: Optional[str] = None, precision: str = "fp32"
+) -> Union[SentenceTransformer, OnnxEmbeddingModel]:
+    """Load an embedding model once per process. Loaded before fork, workers share its pages copy-on-write.
+    
+    The precision actually in effect is recorded on the model as _applied_precision.
+    """
+    if backend == "onnx":
+        model = OnnxEmbeddingModel(model_name, cache_directory=cache_directory, token=token)
+        # The ONNX export is always int8-quantized, whatever EMBEDDING_PRECISION says
+        model._applied_precision = "int8"
+        return model
+    
+    model = SentenceTransformer(model_name, use_auth_token=token)
+    model.eval()
+    model._applied_precision = "fp32"
+    
+    if precision != "fp32":
+        import torch
+        
+        if precision == "int8":
+            # Dynamic int8 Linear layers: quantized weights, int8 matmuls on VNNI/AVX-512 CPUs
+            torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+            model._applied_precision = "int8"
+        elif precision == "fp16" and model.device.type == "cuda":
+            model.half()
+            model._applied_precision = "fp16"
+        else:
+            # CPU half-precision matmuls are slower than fp32, so fp16 only applies on GPU
+            logger.warning(f"Embedding precision {precision} not applied on {model.device.type}; using fp32")
+    # Inference only: no gradient bookkeeping, and tensors live in shared memory across forked workers
+    for parameter in model.parameters():
+        parameter.requires_grad_(False)
+        parameter.share_memory_()
+    return model
+
+
+def preload_embedding_model() -> None:
+    """Load the configured embedding model in the current (pre-fork) process."""
+    settings = get_settings()
+    logger.info(f"Preloading embedding model: {settings.embedding_model} ({settings.embedding_backend} backend)")
+    load_embedding_model(
+        settings.embedding_backend,
+        settings.embedding_model,
+        ONNX_MODEL_CACHE_DIRECTORY,
+        settings.huggingface_token,
+        settings.embedding_precision
+    )
+
 
 class ChromaService:
     """Service for managing ChromaDB operations and document embeddings."""
@@ -23,7 +107,9 @@ class ChromaService:
         self.settings = get_settings()
         self.client: Optional[PersistentClient] = None
         self.collection: Optional[Collection] = None
-        self.embedding_model: Optional[SentenceTransformer] = None
+        self.embedding_model: Optional[Union[SentenceTransformer, OnnxEmbeddingModel]] = None
+        self.query_embedding_model: Optional[StaticEmbeddingModel] = None
+        self._inflight_searches: Dict[tuple, asyncio.Future] = {}
         self.text_chunker = TextChunker(
             chunk_size=self.settings.chunk_size,
             chunk_overlap=self.settings.chunk_overlap
@@ -31,6 +117,13 @@ class ChromaService:
         self._initialize_client()
         self._initialize_collection()
         self._initialize_embedding_model()
+        self.embedding_store = open_embedding_store(
+            os.path.join(self.settings.chroma_persist_directory, "embed_cache"),
+            model_revision=f"{self.settings.embedding_backend}:{self.embedding_model._applied_precision}:{self.settings.embedding_model}",
+            precision=self.settings.embedding_cache_precision
+        )
+        # Components are never torn down after init, so availability is fixed from here on
+        self._available = self._probe_available()
     
     def _initialize_client(self) -> None:
         """Initialize ChromaDB client."""
@@ -55,10 +148,17 @@ class ChromaService:
             if not self.client:
                 raise RuntimeError("ChromaDB client not initialized")
             
-            # Get or create collection
+            # Get or create collection with a tuned HNSW index.
+            # Chroma only applies hnsw:* parameters when the collection is first created.
             self.collection = self.client.get_or_create_collection(
                 name=self.settings.chroma_collection_name,
-                metadata={"description": "Business Analysis School Documents"}
+                metadata={
+                    "description": "Business Analysis School Documents",
+                    "hnsw:space": self.settings.chroma_hnsw_space,
+                    "hnsw:M": self.settings.chroma_hnsw_m,
+                    "hnsw:construction_ef": self.settings.chroma_hnsw_construction_ef,
+                    "hnsw:search_ef": self.settings.chroma_hnsw_search_ef
+                }
             )
             
             logger.info(f"Collection '{self.settings.chroma_collection_name}' initialized successfully")
@@ -69,21 +169,52 @@ class ChromaService:
     def _initialize_embedding_model(self) -> None:
         """Initialize embedding model."""
         try:
-            logger.info(f"Initializing embedding model: {self.settings.embedding_model}")
-            self.embedding_model = SentenceTransformer(self.settings.embedding_model, use_auth_token=self.settings.huggingface_token)
+            logger.info(f"Initializing embedding model: {self.settings.embedding_model} ({self.settings.embedding_backend} backend)")
+            self.embedding_model = load_embedding_model(
+                self.settings.embedding_backend,
+                self.settings.embedding_model,
+                ONNX_MODEL_CACHE_DIRECTORY,
+                self.settings.huggingface_token,
+                self.settings.embedding_precision
+            )
             logger.info("Embedding model initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize embedding model: {e}")
             raise
+        
+        if self.settings.query_embedding_backend == "static":
+            self._initialize_query_embedding_model()
     
-    def is_available(self) -> bool:
-        """Check if ChromaDB service is available."""
+    def _initialize_query_embedding_model(self) -> None:
+        """Initialize the optional static query embedder, falling back to the main model on failure."""
+        try:
+            logger.info(f"Initializing static query embedding model: {self.settings.static_embedding_model}")
+            model = StaticEmbeddingModel(self.settings.static_embedding_model, token=self.settings.huggingface_token)
+            
+            # Queries must land in the same vector space as the ingested documents
+            document_dimension = len(self.embedding_model.encode("dimension probe", convert_to_numpy=True))
+            if model.dimension != document_dimension:
+                raise ValueError(
+                    f"static model dimension {model.dimension} does not match document embeddings ({document_dimension})"
+                )
+            
+            self.query_embedding_model = model
+            logger.info("Static query embedding model initialized successfully")
+        except Exception as e:
+            logger.warning(f"Static query embeddings disabled, using the main embedding model: {e}")
+    
+    def _probe_available(self) -> bool:
+        """Check whether all ChromaDB components were initialized."""
         return (
             self.client is not None and 
             self.collection is not None and 
             self.embedding_model is not None
         )
     
+    def is_available(self) -> bool:
+        """Check if ChromaDB service is available."""
+        return self._available
+    
     def get_status(self) -> Dict[str, Any]:
         """Get service status."""
         return {
@@ -91,16 +222,76 @@ class ChromaService:
             "client_initialized": self.client is not None,
             "collection_initialized": self.collection is not None,
             "embedding_model_initialized": self.embedding_model is not None,
+            "embedding_precision": getattr(self.embedding_model, "_applied_precision", None),
+            "query_embedding_backend": "static" if self.query_embedding_model is not None else self.settings.embedding_backend,
             "collection_name": self.settings.chroma_collection_name,
             "persist_directory": self.settings.chroma_persist_directory
         }
     
-    def get_embedding(self, text: str) -> List[float]:
-        """Get embedding for text."""
+    def get_embedding(self, text: str) -> np.ndarray:
+        """Get embedding for a query text as a float32 vector."""
+        if self.query_embedding_model is not None:
+            return self.query_embedding_model.encode(text)
+        
+        if not self.embedding_model:
+            raise RuntimeError("Embedding model not initialized")
+        
+        return np.asarray(self.embedding_model.encode(text, convert_to_numpy=True), dtype=np.float32)
+    
+    def get_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Get embeddings for many texts in a single batched model call, as a (len(texts), dim) float32 array."""
         if not self.embedding_model:
             raise RuntimeError("Embedding model not initialized")
         
-        return self.embedding_model.encode(text).tolist()
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        
+        if not self.embedding_store:
+            return self._encode(texts)
+        
+        # Serve previously embedded content (overlap windows, re-ingested docs) from the cache
+        keys = [self.embedding_store.make_key(text) for text in texts]
+        cached = self.embedding_store.get_many(keys)
+        missing = {key: text for key, text in zip(keys, texts) if key not in cached}
+        
+        if missing:
+            computed = dict(zip(missing, self._encode(list(missing.values()))))
+            self.embedding_store.put_many(computed)
+            cached.update(computed)
+        
+        return np.stack([cached[key] for key in keys])
+    
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Run the embedding model over a list of texts."""
+        # Passing the whole list lets SentenceTransformer sort inputs by length before batching
+        # (SBERT "smart batching"), so each batch pads only to similar-length neighbours
+        embeddings = self.embedding_model.encode(
+            texts,
+            batch_size=self.settings.embedding_batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=False,
+            show_progress_bar=False
+        )
+        return np.asarray(embeddings, dtype=np.float32)
+    
+    async def _add_in_batches(
+        self,
+        contents: List[str],
+        metadatas: List[Dict[str, Any]],
+        embeddings: np.ndarray,
+        ids: List[str]
+    ) -> None:
+        """Write chunks to the collection in fixed-size sub-batches to keep each write transaction short."""
+        batch_size = self.settings.chroma_add_batch_size
+        for start in range(0, len(ids), batch_size):
+            end = start + batch_size
+            await asyncio.to_thread(
+                self.collection.add,
+                documents=contents[start:end],
+                metadatas=metadatas[start:end],
+                embeddings=embeddings[start:end],
+                ids=ids[start:end]
+            )
     
     async def add_document(self, content: str, metadata: Dict[str, Any]) -> str:
         """Add a single document to collection with chunking. Returns original document ID."""
@@ -109,7 +300,7 @@ class ChromaService:
         
         try:
             # Generate unique ID for the original document
-            original_doc_id = str(uuid.uuid4())
+            original_doc_id = uuid.uuid4().hex
             
             # Chunk the content
             chunks = self.text_chunker.chunk_text(content, metadata)
@@ -119,31 +310,18 @@ class ChromaService:
                 return original_doc_id
             
             # Prepare batch data for all chunks
-            contents = []
-            metadatas = []
-            embeddings = []
-            ids = []
+            contents = [chunk["content"] for chunk in chunks]
+            metadatas = [chunk["metadata"] for chunk in chunks]
+            ids = [chunk["id"] for chunk in chunks]
             
-            for chunk in chunks:
-                chunk_content = chunk["content"]
-                chunk_metadata = chunk["metadata"]
-                chunk_id = chunk["id"]
-                
-                # Get embedding for this chunk
-                embedding = self.get_embedding(chunk_content)
-                
-                contents.append(chunk_content)
-                metadatas.append(chunk_metadata)
-                embeddings.append(embedding)
-                ids.append(chunk_id)
+            # Embed all chunks in one batched call
+            embeddings = await asyncio.to_thread(self.get_embeddings, contents)
             
-            # Add all chunks to collection
-            self.collection.add(
-                documents=contents,
-                metadatas=metadatas,
-                embeddings=embeddings,
-                ids=ids
-            )
+            # Add all chunks to collection; invalidate even on failure, earlier sub-batches may have landed
+            try:
+                await self._add_in_batches(contents, metadatas, embeddings, ids)
+            finally:
+                clear_result_cache()
             
             logger.info(f"Successfully added document with {len(content)} characters as {len(chunks)} chunks")
             return original_doc_id
@@ -152,6 +330,35 @@ class ChromaService:
             logger.error(f"Failed to add document: {e}")
             raise
     
+    def _chunk_document(self, doc_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Chunk one ingestion payload, returning no chunks for empty documents."""
+        content = doc_data.get("content", "")
+        metadata = doc_data.get("metadata", {})
+        doc_id = doc_data.get("id", "unnamed")
+        
+        if not content:
+            logger.warning(f"Skipping document {doc_id} with empty content")
+            return []
+        
+        # Follow headings when the document was extracted as Markdown
+        if metadata.get("content_format") == "markdown":
+            chunks = self.text_chunker.chunk_markdown(content, metadata)
+        else:
+            chunks = self.text_chunker.chunk_text(content, metadata)
+        
+        if not chunks:
+            logger.warning(f"No chunks created from document {doc_id}")
+        return chunks
+    
+    async def _write_chunks(self, chunks: List[Dict[str, Any]]) -> None:
+        """Embed a window of chunks and add them to the collection."""
+        contents = [chunk["content"] for chunk in chunks]
+        metadatas = [chunk["metadata"] for chunk in chunks]
+        ids = [chunk["id"] for chunk in chunks]
+        
+        embeddings = await asyncio.to_thread(self.get_embeddings, contents)
+        await self._add_in_batches(contents, metadatas, embeddings, ids)
+    
     async def add_documents(self, documents_data: List[Dict[str, Any]]) -> bool:
         """Add multiple documents to collection with chunking. Returns True if successful."""
         if not self.collection:
@@ -162,106 +369,199 @@ class ChromaService:
                 logger.warning("No documents provided to add")
                 return False
             
-            # Prepare batch data for all chunks from all documents
-            all_contents = []
-            all_metadatas = []
-            all_embeddings = []
-            all_ids = []
-            total_chunks = 0
+            # Chunk documents in a worker thread while the previous window is embedded and written
+            chunk_queue: asyncio.Queue = asyncio.Queue(maxsize=INGEST_QUEUE_DOCUMENTS)
             
-            for doc_data in documents_data:
-                content = doc_data.get("content", "")
-                metadata = doc_data.get("metadata", {})
-                doc_id = doc_data.get("id", str(uuid.uuid4()))
-                
-                if not content:
-                    logger.warning(f"Skipping document {doc_id} with empty content")
-                    continue
-                
-                # Chunk this document
-                chunks = self.text_chunker.chunk_text(content, metadata)
+            async def produce() -> None:
+                try:
+                    for doc_data in documents_data:
+                        chunks = await asyncio.to_thread(self._chunk_document, doc_data)
+                        if chunks:
+                            await chunk_queue.put(chunks)
+                except BaseException:
+                    # Failed or cancelled: the consumer may have stopped, so never block on a full queue
+                    while not chunk_queue.empty():
+                        chunk_queue.get_nowait()
+                    chunk_queue.put_nowait(None)
+                    raise
+                await chunk_queue.put(None)
+            
+            producer = asyncio.create_task(produce())
+            batch_size = self.settings.chroma_add_batch_size
+            documents_added = 0
+            total_chunks = 0
+            write_started = False
+            try:
+                window: List[Dict[str, Any]] = []
+                while (chunks := await chunk_queue.get()) is not None:
+                    documents_added += 1
+                    window.extend(chunks)
+                    while len(window) >= batch_size:
+                        write_started = True
+                        await self._write_chunks(window[:batch_size])
+                        total_chunks += batch_size
+                        window = window[batch_size:]
                 
-                if not chunks:
-                    logger.warning(f"No chunks created from document {doc_id}")
-                    continue
+                # Surface any chunking error from the producer before writing the buffered window
+                await producer
                 
-                # Add all chunks from this document
-                for chunk in chunks:
-                    chunk_content = chunk["content"]
-                    chunk_metadata = chunk["metadata"]
-                    chunk_id = chunk["id"]
-                    
-                    # Get embedding for this chunk
-                    embedding = self.get_embedding(chunk_content)
-                    
-                    all_contents.append(chunk_content)
-                    all_metadatas.append(chunk_metadata)
-                    all_embeddings.append(embedding)
-                    all_ids.append(chunk_id)
-                    total_chunks += 1
+                if window:
+                    write_started = True
+                    await self._write_chunks(window)
+                    total_chunks += len(window)
+            except Exception:
+                if total_chunks:
+                    logger.warning("Ingestion stopped after writing %d chunks", total_chunks)
+                raise
+            finally:
+                producer.cancel()
+                with contextlib.suppress(asyncio.CancelledError, Exception):
+                    await producer
+                # Writes aren't atomic across batches, so invalidate after any attempted write
+                if write_started:
+                    clear_result_cache()
             
-            if not all_contents:
+            if not total_chunks:
                 logger.warning("No valid chunks to add after processing")
                 return False
             
-            # Add all chunks to collection in one batch
-            self.collection.add(
-                documents=all_contents,
-                metadatas=all_metadatas,
-                embeddings=all_embeddings,
-                ids=all_ids
-            )
-            
-            logger.info(f"Successfully added {len(documents_data)} documents as {total_chunks} chunks to collection")
+            logger.info("Successfully added %d documents as %d chunks to collection", documents_added, total_chunks)
             return True
             
         except Exception as e:
             logger.error(f"Failed to add documents: {e}")
             return False
     
+    async def get_query_embedding(self, query: str) -> np.ndarray:
+        """Embed a search query, serving repeated queries from the in-process cache."""
+        cache_key = make_query_key(query)
+        query_embedding = get_cached_embedding(cache_key)
+        if query_embedding is None:
+            # Embedding is CPU-bound; keep it off the event loop
+            query_embedding = await asyncio.to_thread(self.get_embedding, query)
+            set_cached_embedding(cache_key, query_embedding)
+        return query_embedding
+    
+    async def search_columns(self, query: str, n_results: int = 5) -> Dict[str, List[Any]]:
+        """Search by query text, serving exact and (optionally) near-duplicate repeats from the result cache."""
+        if not self.collection:
+            raise RuntimeError("Collection not initialized")
+        
+        cache_key = make_query_key(query)
+        columns = get_cached_results(cache_key, n_results)
+        if columns is not None:
+            return columns
+        
+        # Coalesce identical queries that arrive while the first is still embedding/searching.
+        # The shared task is shielded so one caller disconnecting doesn't cancel it for the rest;
+        # the collection version keeps a search started before a write from serving later callers.
+        version = get_collection_version()
+        inflight_key = (cache_key, n_results, version)
+        task = self._inflight_searches.get(inflight_key)
+        if task is None:
+            task = asyncio.ensure_future(self._search_columns_uncached(query, cache_key, n_results, version))
+            self._inflight_searches[inflight_key] = task
+            task.add_done_callback(lambda done: self._finish_inflight(inflight_key, done))
+        return await asyncio.shield(task)
+    
+    def _finish_inflight(self, inflight_key: tuple, task: asyncio.Future) -> None:
+        """Forget a finished coalesced search, marking its exception as retrieved."""
+        self._inflight_searches.pop(inflight_key, None)
+        if not task.cancelled():
+            task.exception()
+    
+    async def _search_columns_uncached(
+        self, query: str, cache_key: bytes, n_results: int, version: int
+    ) -> Dict[str, List[Any]]:
+        """Embed and search for a query that missed the result cache, then cache the result."""
+        try:
+            # Get query embedding
+            query_embedding = await self.get_query_embedding(query)
+        except Exception as e:
+            logger.error(f"Failed to search documents: {e}")
+            raise
+        
+        if self.settings.semantic_cache_enabled:
+            similar_key = find_similar_query(query_embedding, self.settings.semantic_cache_threshold)
+            if similar_key is not None:
+                columns = get_cached_results(similar_key, n_results)
+                if columns is not None:
+                    set_cached_results(cache_key, n_results, columns)
+                    return columns
+        
+        columns = await self.search_columns_with_embedding(query_embedding, n_results)
+        # Don't cache results that a concurrent write has already made stale
+        if get_collection_version() == version:
+            set_cached_results(cache_key, n_results, columns)
+            if self.settings.semantic_cache_enabled:
+                remember_query_embedding(cache_key, query_embedding)
+        return columns
+    
     async def search_documents(self, query: str, n_results: int = 5) -> List[DocumentContext]:
         """Search for relevant documents. Returns list of DocumentContext objects."""
+        return columns_to_documents(await self.search_columns(query, n_results))
+    
+    async def search_columns_with_embedding(self, query_embedding: np.ndarray, n_results: int = 5) -> Dict[str, List[Any]]:
+        """Search with a precomputed query embedding, returning parallel result columns."""
         if not self.collection:
             raise RuntimeError("Collection not initialized")
         
         try:
-            # Get query embedding
-            query_embedding = self.get_embedding(query)
-            
             # Search collection
-            results = self.collection.query(
-                query_embeddings=[query_embedding],
+            results = await asyncio.to_thread(
+                self.collection.query,
+                query_embeddings=np.asarray(query_embedding, dtype=np.float32)[np.newaxis, :],
                 n_results=n_results,
                 include=["documents", "metadatas", "distances"]
             )
             
-            # Format results
-            documents = []
-            if results["documents"] and results["documents"][0]:
-                for i, doc in enumerate(results["documents"][0]):
-                    doc_context = DocumentContext(
-                        document_id=results["ids"][0][i] if results["ids"] and results["ids"][0] else f"doc_{i}",
-                        content=doc,
-                        title=results["metadatas"][0][i].get("title", "Unknown Document") if results["metadatas"] and results["metadatas"][0] else "Unknown Document",
-                        source=results["metadatas"][0][i].get("source", "Unknown Source") if results["metadatas"] and results["metadatas"][0] else "Unknown Source",
-                        similarity_score=1.0 - (results["distances"][0][i] if results["distances"] and results["distances"][0] else 0.0)
-                    )
-                    documents.append(doc_context)
+            # Chroma already returns columns; reshape them without building per-row objects
+            contents = results["documents"][0] if results["documents"] else []
+            count = len(contents)
+            ids = results["ids"][0] if results["ids"] and results["ids"][0] else [f"doc_{i}" for i in range(count)]
+            metadatas = results["metadatas"][0] if results["metadatas"] and results["metadatas"][0] else [{}] * count
+            distances = results["distances"][0] if results["distances"] and results["distances"][0] else [0.0] * count
+            
+            columns = {
+                "document_ids": ids[:count],
+                "titles": [metadata.get("title", "Unknown Document") for metadata in metadatas],
+                "contents": contents,
+                "similarity_scores": (1.0 - np.asarray(distances, dtype=np.float64)).tolist(),
+                "sources": [metadata.get("source", "Unknown Source") for metadata in metadatas]
+            }
             
-            logger.info(f"Found {len(documents)} relevant documents")
-            return documents
+            logger.info(f"Found {count} relevant documents")
+            return columns
             
         except Exception as e:
             logger.error(f"Failed to search documents: {e}")
             raise
     
+    async def get_all_documents(self, limit: Optional[int] = None) -> List[DocumentContext]:
+        """Fetch every chunk in the collection (at most limit), for corpora small enough to pass to the LLM whole."""
+        if not self.collection:
+            raise RuntimeError("Collection not initialized")
+        
+        results = await asyncio.to_thread(self.collection.get, limit=limit, include=["documents", "metadatas"])
+        contents = results["documents"] or []
+        metadatas = results["metadatas"] or [{}] * len(contents)
+        
+        return columns_to_documents({
+            "document_ids": results["ids"],
+            "titles": [metadata.get("title", "Unknown Document") for metadata in metadatas],
+            "contents": contents,
+            # Nothing is ranked: the whole corpus goes into the context
+            "similarity_scores": [1.0] * len(contents),
+            "sources": [metadata.get("source", "Unknown Source") for metadata in metadatas]
+        })
+    
     async def get_document_count(self) -> int:
         """Get total document count."""
         if not self.collection:
             return 0
         
         try:
-            return self.collection.count()
+            return await asyncio.to_thread(self.collection.count)
         except Exception as e:
             logger.error(f"Failed to get document count: {e}")
             return 0
@@ -273,13 +573,12 @@ class ChromaService:
         
         try:
             count = self.collection.count()
-            settings = get_settings()
             
             return {
                 "collection_name": self.collection.name,
                 "document_count": count,
-                "embedding_model": settings.embedding_model,
-                "similarity_threshold": settings.similarity_threshold,
+                "embedding_model": self.settings.embedding_model,
+                "similarity_threshold": self.settings.similarity_threshold,
                 "status": "available"
             }
         except Exception as e:
@@ -292,7 +591,8 @@ class ChromaService:
             return False
         
         try:
-            self.collection.delete(ids=[doc_id])
+            await asyncio.to_thread(self.collection.delete, ids=[doc_id])
+            clear_result_cache()
             logger.info(f"Document {doc_id} deleted successfully")
             return True
         except Exception as e:
@@ -306,11 +606,12 @@ class ChromaService:
         
         try:
             # Get all document IDs first
-            all_docs = self.collection.get()
+            all_docs = await asyncio.to_thread(self.collection.get)
             
             if all_docs["ids"]:
                 # Delete all documents by their IDs
-                self.collection.delete(ids=all_docs["ids"])
+                await asyncio.to_thread(self.collection.delete, ids=all_docs["ids"])
+                clear_result_cache()
                 logger.info(f"Collection cleared successfully - {len(all_docs['ids'])} documents removed")
             else:
                 logger.info("Collection is already empty")
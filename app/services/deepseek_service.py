@@ -5,19 +5,27 @@ Provides LLM operations using multiple DeepSeek API keys with load balancing and
 import asyncio
 import random
 import time
-import requests
-from typing import Dict, Any, Optional, List
+import httpx
+import orjson
+from typing import AsyncIterator, Dict, Any, Optional, List, Tuple
 from app.config.settings import get_settings
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 settings = get_settings()
 
+# Connection pool limits for the service-wide HTTP client
+HTTP_POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=32)
+HTTP_TIMEOUT_SECONDS = 30.0
+
+# Seconds between re-checks of rate-limited models in the usable-model view
+USABLE_REFRESH_SECONDS = 1.0
+
 
 class DeepSeekModelConfig:
     """Configuration for a single DeepSeek model instance."""
     
-    def __init__(self, name: str, api_key: str, api_url: str, model: str, priority: int):
+    def __init__(self, name: str, api_key: str, api_url: str, model: str, priority: int, client: httpx.AsyncClient):
         self.name = name
         self.api_key = api_key
         self.api_url = api_url
@@ -27,6 +35,7 @@ class DeepSeekModelConfig:
         self.error_count = 0
         self.rate_limit_reset = 0
         self.is_available = True
+        self.client = client
     
     def mark_used(self):
         """Mark this model as used."""
@@ -65,6 +74,15 @@ class EnhancedDeepSeekService:
         """Initialize enhanced DeepSeek service with multiple API key configurations."""
         self.models: List[DeepSeekModelConfig] = []
         self._available = False
+        # Usable-model view, rebuilt on error/success or once rate-limit resets may have elapsed
+        self._usable: List[DeepSeekModelConfig] = []
+        self._usable_checked_at = float("-inf")
+        # All API key slots share one pool; slots on the same host multiplex over HTTP/2
+        self._http = httpx.AsyncClient(
+            timeout=HTTP_TIMEOUT_SECONDS,
+            http2=True,
+            limits=HTTP_POOL_LIMITS
+        )
         self._initialize_models()
         
         # Set as available if models are configured (no API testing to save quota)
@@ -74,29 +92,50 @@ class EnhancedDeepSeekService:
     
     def _initialize_models(self) -> None:
         """Initialize available DeepSeek models from settings."""
-        available_models = settings.get_available_models()
+        available_models = settings.available_models
         
         if not available_models:
             logger.error("No DeepSeek models configured")
             return
         
-        for model_config in available_models:
+        # Specs are already sorted by priority
+        for model_spec in available_models:
             model = DeepSeekModelConfig(
-                name=model_config["name"],
-                api_key=model_config["api_key"],
-                api_url=model_config["api_url"],
-                model=model_config["model"],
-                priority=model_config["priority"]
+                name=model_spec.name,
+                api_key=model_spec.api_key,
+                api_url=model_spec.api_url,
+                model=model_spec.model,
+                priority=model_spec.priority,
+                client=self._http
             )
             self.models.append(model)
             logger.info(f"Initialized DeepSeek model: {model.name}")
-        
-        # Sort by priority
-        self.models.sort(key=lambda x: x.priority)
+    
+    def _refresh_usable(self) -> None:
+        """Rebuild the list of models that can currently take requests."""
+        self._usable = [model for model in self.models if model.can_use()]
+        self._usable_checked_at = time.monotonic()
+    
+    def _usable_models(self) -> List[DeepSeekModelConfig]:
+        """Models that can currently take requests; rate-limited models are re-checked at most once per tick."""
+        if time.monotonic() - self._usable_checked_at >= USABLE_REFRESH_SECONDS:
+            self._refresh_usable()
+        return self._usable
+    
+    def _record_error(self, model: DeepSeekModelConfig, is_rate_limit: bool = False) -> None:
+        """Mark a model as having failed and update the usable view."""
+        model.mark_error(is_rate_limit=is_rate_limit)
+        self._refresh_usable()
+    
+    def _record_success(self, model: DeepSeekModelConfig) -> None:
+        """Mark a model as used successfully and update the usable view."""
+        model.mark_used()
+        model.reset_errors()
+        self._refresh_usable()
     
     def is_available(self) -> bool:
         """Check if any DeepSeek service is available."""
-        return self._available and any(model.can_use() for model in self.models)
+        return self._available and bool(self._usable_models())
     
     def get_status(self) -> Dict[str, Any]:
         """Get service status for all DeepSeek models."""
@@ -114,59 +153,68 @@ class EnhancedDeepSeekService:
         
         return {
             "overall_status": "available" if self._available else "unavailable",
-            "available_models": len([m for m in self.models if m.can_use()]),
+            "available_models": len(self._usable_models()),
             "total_models": len(self.models),
             "models": model_statuses
         }
     
-    def _select_model(self, exclude_attempted: set = set()) -> Optional[DeepSeekModelConfig]:
-        """Select the best available DeepSeek model using load balancing and priority."""
-        available_models = [m for m in self.models if m.can_use() and m.name not in exclude_attempted]
+    def _select_model(self, exclude_attempted: frozenset = frozenset()) -> Optional[DeepSeekModelConfig]:
+        """Select the best available DeepSeek model using load balancing and priority. Excludes models by id()."""
+        available_models = [m for m in self._usable_models() if id(m) not in exclude_attempted]
         
         if not available_models:
             return None
         
         if settings.enable_load_balancing and len(available_models) > 1:
-            # Load balancing: select random model from available ones
-            return random.choice(available_models)
+            # Load balancing: power of two choices, preferring fewer recent errors, then the longer-idle model
+            candidates = random.sample(available_models, 2)
+            return min(candidates, key=lambda m: (m.error_count, m.last_used))
         else:
             # Priority-based: select first available model
             return available_models[0]
     
+    def _build_request(self, model: DeepSeekModelConfig, messages: List[Dict[str, str]],
+                       max_tokens: int, temperature: float, stream: bool = False) -> Tuple[Dict[str, str], bytes]:
+        """Build headers and the serialized JSON body for a chat-completions request."""
+        headers = {
+            "Authorization": f"Bearer {model.api_key}",
+            "Content-Type": "application/json",
+        }
+        
+        data = {
+            "model": model.model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature
+        }
+        if stream:
+            data["stream"] = True
+        
+        return headers, orjson.dumps(data)
+    
     async def _make_request(self, model: DeepSeekModelConfig, messages: List[Dict[str, str]], 
                            max_tokens: int, temperature: float) -> str:
         """Make API request to a specific DeepSeek model."""
         try:
-            headers = {
-                "Authorization": f"Bearer {model.api_key}",
-                "Content-Type": "application/json",
-            }
-            
-            data = {
-                "model": model.model,
-                "messages": messages,
-                "max_tokens": max_tokens,
-                "temperature": temperature
-            }
+            headers, body = self._build_request(model, messages, max_tokens, temperature)
             
             logger.info(f"Sending request to DeepSeek {model.name}")
             
-            response = requests.post(
-                model.api_url, 
-                json=data, 
-                headers=headers, 
-                timeout=30
+            response = await model.client.post(
+                model.api_url,
+                content=body,
+                headers=headers
             )
             
             if response.status_code == 429:  # Rate limit
                 logger.warning(f"Rate limit hit for DeepSeek {model.name}")
-                model.mark_error(is_rate_limit=True)
-                available_count = len([m for m in self.models if m.can_use()])
+                self._record_error(model, is_rate_limit=True)
+                available_count = len(self._usable_models())
                 logger.info(f"DeepSeek {model.name} rate limited. {available_count} models still available")
                 raise RuntimeError(f"Rate limit exceeded for DeepSeek {model.name}")
             
             response.raise_for_status()
-            result = response.json()
+            result = orjson.loads(response.content)
             
             # Extract response content
             if (result.get("choices") and 
@@ -174,23 +222,57 @@ class EnhancedDeepSeekService:
                 result["choices"][0]["message"].get("content")):
                 
                 content = result["choices"][0]["message"]["content"]
-                model.mark_used()
-                model.reset_errors()
+                self._record_success(model)
                 logger.info(f"Response received from DeepSeek {model.name}: {len(content)} characters")
                 return content.strip()
             else:
                 logger.error(f"Invalid response structure from DeepSeek {model.name}")
                 raise RuntimeError(f"Invalid response structure from DeepSeek {model.name}")
                 
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"API request failed for DeepSeek {model.name}: {e}")
-            model.mark_error()
+            self._record_error(model)
             raise RuntimeError(f"API request failed for DeepSeek {model.name}: {e}")
         except Exception as e:
             logger.error(f"Unexpected error with DeepSeek {model.name}: {e}")
-            model.mark_error()
+            self._record_error(model)
             raise RuntimeError(f"Service error with DeepSeek {model.name}: {e}")
     
+    async def _open_stream(self, model: DeepSeekModelConfig, messages: List[Dict[str, str]],
+                           max_tokens: int, temperature: float) -> httpx.Response:
+        """Open a streaming chat-completions request to a specific DeepSeek model."""
+        try:
+            headers, body = self._build_request(model, messages, max_tokens, temperature, stream=True)
+            
+            logger.info(f"Opening stream to DeepSeek {model.name}")
+            
+            request = model.client.build_request("POST", model.api_url, content=body, headers=headers)
+            response = await model.client.send(request, stream=True)
+            
+            if response.status_code == 429:  # Rate limit
+                logger.warning(f"Rate limit hit for DeepSeek {model.name}")
+                await response.aclose()
+                self._record_error(model, is_rate_limit=True)
+                raise RuntimeError(f"Rate limit exceeded for DeepSeek {model.name}")
+            
+            if response.is_error:
+                await response.aclose()
+                response.raise_for_status()
+            return response
+            
+        except httpx.HTTPError as e:
+            logger.error(f"Stream request failed for DeepSeek {model.name}: {e}")
+            self._record_error(model)
+            raise RuntimeError(f"Stream request failed for DeepSeek {model.name}: {e}")
+    
+    def _build_messages(self, messages: List[Dict[str, str]], system_prompt: Optional[str]) -> List[Dict[str, str]]:
+        """Prepend the system prompt (if any) to the conversation messages."""
+        api_messages = []
+        if system_prompt:
+            api_messages.append({"role": "system", "content": system_prompt})
+        api_messages.extend(messages)
+        return api_messages
+    
     async def generate_response(
         self, 
         messages: List[Dict[str, str]], 
@@ -202,24 +284,20 @@ class EnhancedDeepSeekService:
         if not self.is_available():
             raise RuntimeError("No DeepSeek services are available")
         
-        # Prepare messages
-        api_messages = []
-        if system_prompt:
-            api_messages.append({"role": "system", "content": system_prompt})
-        api_messages.extend(messages)
+        api_messages = self._build_messages(messages, system_prompt)
         
         # Track which models we've already tried
-        attempted_models = set()
+        attempted_ids = set()
         
         # Try each available model with retries
         for attempt in range(settings.max_retries):
             # Get next available model (excluding already attempted ones)
-            model = self._select_model(exclude_attempted=attempted_models)
+            model = self._select_model(exclude_attempted=frozenset(attempted_ids))
             if not model:
                 raise RuntimeError("No available DeepSeek models")
             
             # Mark this model as attempted
-            attempted_models.add(model.name)
+            attempted_ids.add(id(model))
             
             try:
                 return await self._make_request(model, api_messages, max_tokens, temperature)
@@ -227,7 +305,7 @@ class EnhancedDeepSeekService:
                 logger.warning(f"Attempt {attempt + 1} failed with DeepSeek {model.name}: {e}")
                 if attempt < settings.max_retries - 1:
                     # Check if we still have other models to try
-                    remaining_models = [m for m in self.models if m.can_use() and m.name not in attempted_models]
+                    remaining_models = [m for m in self._usable_models() if id(m) not in attempted_ids]
                     if not remaining_models:
                         logger.error("No more DeepSeek models available to try")
                         raise RuntimeError("All DeepSeek models are unavailable")
@@ -238,3 +316,71 @@ class EnhancedDeepSeekService:
                     raise RuntimeError(f"All DeepSeek models failed after {settings.max_retries} attempts")
         
         raise RuntimeError("Failed to generate response")
+
+    async def generate_response_stream(
+        self,
+        messages: List[Dict[str, str]],
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 1000,
+        temperature: float = 0.7
+    ) -> AsyncIterator[str]:
+        """Stream response content deltas. Falls back to other models only before the first delta."""
+        if not self.is_available():
+            raise RuntimeError("No DeepSeek services are available")
+        
+        api_messages = self._build_messages(messages, system_prompt)
+        
+        # Track which models we've already tried
+        attempted_ids = set()
+        model = None
+        response = None
+        
+        for attempt in range(settings.max_retries):
+            model = self._select_model(exclude_attempted=frozenset(attempted_ids))
+            if not model:
+                raise RuntimeError("No available DeepSeek models")
+            
+            attempted_ids.add(id(model))
+            
+            try:
+                response = await self._open_stream(model, api_messages, max_tokens, temperature)
+                break
+            except Exception as e:
+                logger.warning(f"Stream attempt {attempt + 1} failed with DeepSeek {model.name}: {e}")
+                if attempt < settings.max_retries - 1:
+                    await asyncio.sleep(settings.retry_delay)
+                    continue
+                raise RuntimeError(f"All DeepSeek models failed after {settings.max_retries} attempts")
+        
+        if response is None:
+            raise RuntimeError("Failed to open response stream")
+        
+        try:
+            async for line in response.aiter_lines():
+                # Skip SSE comments and keep-alives
+                if not line.startswith("data: "):
+                    continue
+                
+                payload = line[len("data: "):]
+                if payload == "[DONE]":
+                    break
+                
+                chunk = orjson.loads(payload)
+                if chunk.get("choices"):
+                    delta = chunk["choices"][0].get("delta", {}).get("content")
+                    if delta:
+                        yield delta
+            
+            self._record_success(model)
+            logger.info(f"Stream completed from DeepSeek {model.name}")
+        except httpx.HTTPError as e:
+            logger.error(f"Stream interrupted for DeepSeek {model.name}: {e}")
+            self._record_error(model)
+            raise RuntimeError(f"Stream interrupted for DeepSeek {model.name}: {e}")
+        finally:
+            await response.aclose()
+    
+    async def close(self) -> None:
+        """Close the pooled HTTP client."""
+        await self._http.aclose()
+        logger.info("DeepSeek HTTP client closed")
@@ -1,17 +1,73 @@
 """
 Document service for managing PDF uploads and text document processing.
 """
+import asyncio
+import io
 import logging
+import os
+import sys
 import uuid
-from typing import List, Dict, Any, Optional
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Tuple
+import aiofiles
+import aiofiles.os
+import aiofiles.tempfile
 from fastapi import UploadFile
 
 from app.services.chroma_service import ChromaService
-from app.utils.pdf_extractor import PDFExtractor
+from app.utils.cpu_pool import get_cpu_pool
+from app.utils.pdf_extractor import PDF_MAGIC, PDFExtractor
 from app.models.documents import TextDocumentRequest
 
 logger = logging.getLogger(__name__)
 
+# Size of each read when streaming an upload to disk
+UPLOAD_READ_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# Pages handed to each process-pool task when a large PDF is split up
+PAGES_PER_EXTRACTION_TASK = 50
+
+# File-to-file sendfile is Linux-only; elsewhere uploads are copied in chunks
+SENDFILE_AVAILABLE = sys.platform.startswith("linux") and hasattr(os, "sendfile")
+
+# Bound concurrent PDF parses so a large batch doesn't thrash the CPU
+MAX_CONCURRENT_PDF_PARSES = os.cpu_count() or 1
+
+# Static metadata shared by every ingested document of each kind
+_TEXT_METADATA = {
+    "type": "text",
+    "source": "user_upload",
+    "tags": "text,user_content"  # Convert list to comma-separated string
+}
+_PDF_METADATA = {"type": "pdf"}
+
+
+def _upload_fd(upload: UploadFile) -> Optional[int]:
+    """Return the OS file descriptor behind an upload, or None while it is still held in memory.
+    
+    Starlette spools uploads in a SpooledTemporaryFile that only rolls over to a real temp file once it
+    grows large. Its fileno() would force that rollover, so the wrapped file object is checked instead.
+    """
+    underlying = getattr(upload.file, "_file", upload.file)
+    return underlying.fileno() if isinstance(underlying, io.BufferedRandom) else None
+
+
+def _sendfile_copy(source_fd: int, target_fd: int, offset: int) -> int:
+    """Copy source_fd from offset to its end onto target_fd in the kernel. Returns bytes copied."""
+    remaining = os.fstat(source_fd).st_size - offset
+    copied = 0
+    while copied < remaining:
+        sent = os.sendfile(target_fd, source_fd, offset + copied, remaining - copied)
+        if not sent:
+            break
+        copied += sent
+    return copied
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time in the ISO-8601 'Z' form stored in document metadata."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
 
 class DocumentService:
     """Service class for document management operations."""
@@ -20,40 +76,47 @@ class DocumentService:
         """Initialize the document service."""
         self.chroma_service = ChromaService()
         self.last_document_id = None
+        # Shared across requests so concurrent uploads together stay within the parse bound
+        self._parse_semaphore = asyncio.Semaphore(MAX_CONCURRENT_PDF_PARSES)
     
     async def add_text_document(self, content: str, chroma_service: ChromaService) -> bool:
         """Add a text document to the knowledge base. Returns True if successful."""
+        return await self.add_text_documents([content], chroma_service)
+    
+    async def add_text_documents(self, contents: List[str], chroma_service: ChromaService) -> bool:
+        """Add many text documents in one batched ingestion call. Prefer this over repeated add_text_document calls."""
         try:
-            # Generate unique ID
-            doc_id = str(uuid.uuid4())
-            self.last_document_id = doc_id
+            # Generate unique IDs and prepare document data with default metadata
+            added_at = _utc_timestamp()
+            documents_data = []
+            for content in contents:
+                doc_id = uuid.uuid4().hex
+                documents_data.append({
+                    "id": doc_id,
+                    "content": content,
+                    "metadata": {
+                        **_TEXT_METADATA,
+                        "title": f"Text Document {doc_id[:8]}",
+                        "content_length": len(content),
+                        "added_at": added_at
+                    }
+                })
             
-            # Prepare document data with default metadata
-            document_data = {
-                "id": doc_id,
-                "content": content,
-                "metadata": {
-                    "type": "text",
-                    "title": f"Text Document {doc_id[:8]}",
-                    "source": "user_upload",
-                    "tags": "text,user_content",  # Convert list to comma-separated string
-                    "content_length": len(content),
-                    "added_at": "2024-01-15T10:30:00Z"
-                }
-            }
+            if documents_data:
+                self.last_document_id = documents_data[-1]["id"]
             
-            # Add document to ChromaDB
-            success = await chroma_service.add_documents([document_data])
+            # Add all documents to ChromaDB in one call; it windows the writes by CHROMA_ADD_BATCH_SIZE
+            success = await chroma_service.add_documents(documents_data)
             
             if not success:
-                logger.error("Failed to add text document to knowledge base")
+                logger.error("Failed to add text documents to knowledge base")
                 return False
             
-            logger.info(f"Successfully added text document with {len(content)} characters")
+            logger.info("Successfully added %d text documents", len(documents_data))
             return True
             
         except Exception as e:
-            logger.error(f"Failed to add text document: {e}")
+            logger.error("Failed to add text documents: %s", e)
             return False
     
     async def upload_pdfs(self, files: List[UploadFile]) -> Dict[str, Any]:
@@ -61,24 +124,25 @@ class DocumentService:
         if not files:
             raise ValueError("No files provided")
         
-        logger.info(f"Processing {len(files)} PDF files for upload")
+        logger.info("Processing %d PDF files for upload", len(files))
         
-        documents_data = []
-        pdfs_processed = 0
-        pdfs_failed = 0
+        # One timestamp for the whole batch
+        added_at = _utc_timestamp()
         
-        for pdf_file in files:
-            try:
-                result = await self._process_single_pdf(pdf_file)
-                if result:
-                    documents_data.append(result)
-                    pdfs_processed += 1
-                else:
-                    pdfs_failed += 1
-            except Exception as e:
-                logger.error(f"Failed to process PDF {pdf_file.filename}: {e}")
-                pdfs_failed += 1
-                continue
+        # Process all files concurrently; only the CPU-bound parse is bounded
+        results = await asyncio.gather(
+            *(self._process_single_pdf(pdf_file, added_at) for pdf_file in files),
+            return_exceptions=True
+        )
+        
+        documents_data = []
+        for pdf_file, result in zip(files, results):
+            if isinstance(result, Exception):
+                logger.error("Failed to process PDF %s: %s", pdf_file.filename, result)
+            elif result:
+                documents_data.append(result)
+        pdfs_processed = len(documents_data)
+        pdfs_failed = len(files) - pdfs_processed
         
         if not documents_data:
             raise ValueError("No PDFs could be processed successfully")
@@ -90,7 +154,7 @@ class DocumentService:
             raise RuntimeError("Failed to add documents to knowledge base")
         
         total_added = len(documents_data)
-        logger.info(f"Successfully added {total_added} PDF documents to knowledge base")
+        logger.info("Successfully added %d PDF documents to knowledge base", total_added)
         
         return {
             "success": True,
@@ -100,52 +164,111 @@ class DocumentService:
             "total_documents_added": total_added
         }
     
-    async def _process_single_pdf(self, pdf_file: UploadFile) -> Optional[Dict[str, Any]]:
+    async def _process_single_pdf(self, pdf_file: UploadFile, added_at: str) -> Optional[Dict[str, Any]]:
         """Process a single PDF file. Returns document data or None if processing fails."""
         # Validate file type
         if not pdf_file.filename.lower().endswith('.pdf'):
-            logger.warning(f"Skipping non-PDF file: {pdf_file.filename}")
+            logger.warning("Skipping non-PDF file: %s", pdf_file.filename)
             return None
         
-        # Read file content
-        file_content = await pdf_file.read()
-        
-        # Validate PDF content
-        if not PDFExtractor.is_valid_pdf(file_content):
-            logger.warning(f"Invalid PDF file: {pdf_file.filename}")
+        # Validate PDF content from the header's magic bytes before spooling anything
+        chunk = await pdf_file.read(len(PDF_MAGIC))
+        if chunk != PDF_MAGIC:
+            logger.warning("Invalid PDF file: %s", pdf_file.filename)
             return None
         
-        # Extract text from PDF
-        extracted_text = PDFExtractor.extract_text_from_bytes(file_content)
+        # Stream the upload to a temp file instead of holding it all in memory
+        tmp_path = None
+        try:
+            async with aiofiles.tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp_file:
+                tmp_path = tmp_file.name
+                await tmp_file.write(chunk)
+                file_size = len(chunk)
+                
+                # Starlette rolls large uploads over to a real temp file; copy the rest of
+                # it kernel-side instead of bouncing 1 MiB chunks through Python
+                source_fd = _upload_fd(pdf_file) if SENDFILE_AVAILABLE else None
+                if source_fd is not None:
+                    try:
+                        await tmp_file.flush()
+                        file_size += await asyncio.to_thread(
+                            _sendfile_copy, source_fd, tmp_file.fileno(), len(chunk)
+                        )
+                        chunk = b""
+                    except OSError as e:
+                        logger.info("sendfile unavailable for %s, copying in chunks: %s", pdf_file.filename, e)
+                        await tmp_file.seek(len(chunk))
+                        await tmp_file.truncate()
+                        file_size = len(chunk)
+                
+                if chunk:
+                    chunk = await pdf_file.read(UPLOAD_READ_CHUNK_SIZE)
+                while chunk:
+                    await tmp_file.write(chunk)
+                    file_size += len(chunk)
+                    chunk = await pdf_file.read(UPLOAD_READ_CHUNK_SIZE)
+            
+            # Extract text from PDF (CPU-bound, run in the shared process pool).
+            # Prefer Markdown so chunks can follow the document's heading structure.
+            loop = asyncio.get_running_loop()
+            cpu_pool = get_cpu_pool()
+            
+            async with self._parse_semaphore:
+                # Large PDFs are split into page ranges so one document can use every pool worker
+                page_count = await asyncio.to_thread(PDFExtractor.count_pages, tmp_path)
+                page_ranges = [
+                    list(range(start, min(start + PAGES_PER_EXTRACTION_TASK, page_count)))
+                    for start in range(0, page_count, PAGES_PER_EXTRACTION_TASK)
+                ] if page_count > PAGES_PER_EXTRACTION_TASK else [None]
+                
+                async def extract(pages: Optional[List[int]]) -> Tuple[Optional[str], str]:
+                    # Fall back to plain text per range so one failed range doesn't drop its pages
+                    markdown = await loop.run_in_executor(
+                        cpu_pool, PDFExtractor.extract_markdown_from_file, tmp_path, pages
+                    )
+                    if markdown:
+                        return markdown, "markdown"
+                    text = await loop.run_in_executor(cpu_pool, PDFExtractor.extract_text_from_file, tmp_path, pages)
+                    return text, "text"
+                
+                parts = await asyncio.gather(*(extract(pages) for pages in page_ranges))
+                extracted_text = "\n\n".join(part for part, _ in parts if part) or None
+                # Plain-text ranges read fine as Markdown bodies, so any Markdown range keeps heading-aware chunking
+                content_format = "markdown" if any(part_format == "markdown" for _, part_format in parts) else "text"
+        finally:
+            if tmp_path:
+                await aiofiles.os.remove(tmp_path)
         
         if not extracted_text:
-            logger.warning(f"Failed to extract text from PDF: {pdf_file.filename}")
+            logger.warning("Failed to extract text from PDF: %s", pdf_file.filename)
             return None
         
         # Generate unique ID
-        doc_id = str(uuid.uuid4())
+        doc_id = uuid.uuid4().hex
         
         # Prepare document data
         document_data = {
             "id": doc_id,
             "content": extracted_text,
             "metadata": {
-                "type": "pdf",
+                **_PDF_METADATA,
+                "doc_id": doc_id,
+                "content_format": content_format,
                 "source": pdf_file.filename,
                 "original_filename": pdf_file.filename,
-                "file_size": len(file_content),
-                "added_at": "2024-01-15T10:30:00Z"
+                "file_size": file_size,
+                "added_at": added_at
             }
         }
         
-        logger.info(f"Successfully processed PDF: {pdf_file.filename}")
+        logger.info("Successfully processed PDF: %s", pdf_file.filename)
         return document_data
     
     async def get_documents(self) -> Dict[str, Any]:
         """Get information about all documents in the knowledge base. Returns document info dict."""
         try:
-            # Get collection info
-            collection_info = self.chroma_service.get_collection_info()
+            # Get collection info (counts the collection, so keep it off the event loop)
+            collection_info = await asyncio.to_thread(self.chroma_service.get_collection_info)
             
             # Get document count
             document_count = await self.chroma_service.get_document_count()
@@ -157,7 +280,7 @@ class DocumentService:
                 "message": "Knowledge base information retrieved successfully"
             }
         except Exception as e:
-            logger.error(f"Failed to get documents: {e}")
+            logger.error("Failed to get documents: %s", e)
             return {
                 "status": "error",
                 "error": str(e),
@@ -187,7 +310,7 @@ class DocumentService:
                 }
                 
         except Exception as e:
-            logger.error(f"Failed to clear knowledge base: {e}")
+            logger.error("Failed to clear knowledge base: %s", e)
             return {
                 "status": "error",
                 "error": str(e),
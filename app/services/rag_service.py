@@ -3,7 +3,10 @@ RAG service for the AI Student Support Service.
 Handles document retrieval and context building for AI responses.
 """
 from typing import List, Dict, Any, Optional
+from app.config.settings import get_settings
+from app.models.search import DocumentContext
 from app.services.chroma_service import ChromaService
+from app.utils.embedding_cache import get_collection_version
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -16,10 +19,34 @@ class RAGService:
         """Initialize RAG service."""
         self.chroma_service = None  # Will be set later
         self._ai_service = None
+        self.settings = get_settings()
+        # Cache-augmented generation: the whole (small) corpus, tagged with the collection version it reflects
+        self._cag_corpus: Optional[List[Dict[str, Any]]] = None
+        self._cag_version: Optional[int] = None
     
     def set_chroma_service(self, chroma_service: ChromaService) -> None:
         """Set ChromaDB service reference."""
         self.chroma_service = chroma_service
+        self.refresh_cag()
+    
+    def refresh_cag(self) -> None:
+        """Drop the preloaded CAG corpus so the next retrieval reloads it."""
+        self._cag_corpus = None
+        self._cag_version = None
+    
+    async def _get_cag_corpus(self) -> Optional[List[Dict[str, Any]]]:
+        """Return the whole corpus when it is small enough for CAG, else None to fall back to retrieval."""
+        version = get_collection_version()
+        if self._cag_version != version:
+            # Any collection write since the last load bumps the version; re-check size and reload
+            corpus = None
+            if await self.chroma_service.get_document_count() <= self.settings.cag_max_chunks:
+                # Writes can land between the count and the fetch, so the fetch is capped to the budget too
+                corpus = self._format_results(
+                    await self.chroma_service.get_all_documents(limit=self.settings.cag_max_chunks)
+                )
+            self._cag_corpus, self._cag_version = corpus, version
+        return self._cag_corpus
     
     def set_ai_service(self, ai_service: Any) -> None:
         """Set AI service reference to avoid circular dependency."""
@@ -44,6 +71,12 @@ class RAGService:
                 logger.warning("ChromaDB service not available")
                 return []
             
+            # Small knowledge base: skip the vector search and hand the LLM the whole corpus
+            if self.settings.cag_max_chunks:
+                corpus = await self._get_cag_corpus()
+                if corpus is not None:
+                    return corpus
+            
             # Search for relevant documents
             results = await self.chroma_service.search_documents(query, n_results)
             
@@ -51,46 +84,29 @@ class RAGService:
                 logger.info("No relevant documents found")
                 return []
             
-            # Format results - DocumentContext objects have attributes, not dict methods
-            formatted_results = []
-            for doc in results:
-                formatted_results.append({
-                    "document_id": getattr(doc, "document_id", "unknown"),
-                    "content": getattr(doc, "content", ""),
-                    "title": getattr(doc, "title", "Unknown Document"),
-                    "source": getattr(doc, "source", "Unknown Source"),
-                    "similarity_score": getattr(doc, "similarity_score", 0.0),
-                    "metadata": {
-                        "title": getattr(doc, "title", "Unknown Document"),
-                        "source": getattr(doc, "source", "Unknown Source"),
-                        "type": "document"
-                    }
-                })
-            
-            logger.info(f"Retrieved {len(formatted_results)} relevant documents")
+            formatted_results = self._format_results(results)
+            logger.info("Retrieved %d relevant documents", len(formatted_results))
             return formatted_results
             
         except Exception as e:
-            logger.error(f"Error retrieving relevant documents: {e}")
+            logger.error("Error retrieving relevant documents: %s", e)
             return []
     
-    def build_context_from_documents(self, documents: List[Dict[str, Any]]) -> str:
-        """Build context string from retrieved documents."""
-        if not documents:
-            return ""
-        
-        context_parts = []
-        for i, doc in enumerate(documents, 1):
-            title = doc.get("title", "Unknown Document")
-            content = doc.get("content", "")
-            source = doc.get("source", "Unknown Source")
-            score = doc.get("similarity_score", 0.0)
-            
-            context_parts.append(f"Document {i}: {title}")
-            context_parts.append(f"Source: {source}")
-            context_parts.append(f"Relevance Score: {score:.3f}")
-            context_parts.append(f"Content: {content}")
-            context_parts.append("---")
-        
-        return "\n".join(context_parts)
-
+    def _format_results(self, results: List[DocumentContext]) -> List[Dict[str, Any]]:
+        """Convert DocumentContext results into the dict shape consumed by the AI service."""
+        # DocumentContext objects have attributes, not dict methods
+        formatted_results = []
+        for doc in results:
+            formatted_results.append({
+                "document_id": getattr(doc, "document_id", "unknown"),
+                "content": getattr(doc, "content", ""),
+                "title": getattr(doc, "title", "Unknown Document"),
+                "source": getattr(doc, "source", "Unknown Source"),
+                "similarity_score": getattr(doc, "similarity_score", 0.0),
+                "metadata": {
+                    "title": getattr(doc, "title", "Unknown Document"),
+                    "source": getattr(doc, "source", "Unknown Source"),
+                    "type": "document"
+                }
+            })
+        return formatted_results
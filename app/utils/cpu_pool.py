@@ -0,0 +1,33 @@
+"""
+Shared process pool for CPU-bound work such as PDF parsing.
+Keeps heavy parsing off the event loop without running extra uvicorn workers.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_cpu_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_cpu_pool() -> ProcessPoolExecutor:
+    """Get the process pool, creating it on first use."""
+    global _cpu_pool
+    if _cpu_pool is None:
+        max_workers = os.cpu_count() or 1
+        # Default (fork) context: spawn or forkserver children re-import main.py as __mp_main__,
+        # which builds the document service and loads the embedding model again in every worker
+        _cpu_pool = ProcessPoolExecutor(max_workers=max_workers)
+        logger.info(f"CPU process pool started with {max_workers} workers")
+    return _cpu_pool
+
+
+def shutdown_cpu_pool() -> None:
+    """Shut down the process pool if it was started."""
+    global _cpu_pool
+    if _cpu_pool is not None:
+        _cpu_pool.shutdown(wait=True, cancel_futures=True)
+        _cpu_pool = None
+        logger.info("CPU process pool shut down")
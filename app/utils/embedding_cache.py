@@ -0,0 +1,107 @@
+"""
+In-process caches for query embeddings and search results.
+Avoids re-running the embedding model for repeated student queries.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+from cachetools import TTLCache
+import numpy as np
+
+# Module-level singletons shared by every request handled in this process
+EMBED_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=3600)
+RESULT_CACHE: TTLCache = TTLCache(maxsize=1_000, ttl=3600)
+
+# cachetools caches are not thread-safe on their own
+_cache_lock = threading.Lock()
+
+# Unit-normalized embeddings of queries whose results are cached, for near-duplicate lookups.
+# The stacked matrix is rebuilt lazily after the key set changes.
+_semantic_embeddings: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+_semantic_matrix: Optional[np.ndarray] = None
+_semantic_keys: List[bytes] = []
+
+# Bumped on every collection write so snapshot holders (e.g. the CAG corpus) know to reload
+_collection_version = 0
+
+
+def make_query_key(query: str) -> bytes:
+    """Build a cache key from the normalized query text."""
+    # blake2b is faster than sha256 on CPUs without SHA extensions; 16 bytes is ample for an in-process key
+    return hashlib.blake2b(query.strip().lower().encode("utf-8"), digest_size=16).digest()
+
+
+def get_cached_embedding(key: bytes) -> Optional[np.ndarray]:
+    """Get a cached query embedding, or None on a miss."""
+    with _cache_lock:
+        return EMBED_CACHE.get(key)
+
+
+def set_cached_embedding(key: bytes, embedding: np.ndarray) -> None:
+    """Store a query embedding in the cache."""
+    with _cache_lock:
+        EMBED_CACHE[key] = embedding
+
+
+def get_cached_results(key: bytes, n_results: int) -> Optional[Dict[str, List[Any]]]:
+    """Get cached search result columns for a (query, n_results) pair, or None on a miss."""
+    with _cache_lock:
+        return RESULT_CACHE.get((key, n_results))
+
+
+def set_cached_results(key: bytes, n_results: int, results: Dict[str, List[Any]]) -> None:
+    """Store search result columns for a (query, n_results) pair."""
+    with _cache_lock:
+        RESULT_CACHE[(key, n_results)] = results
+
+
+def remember_query_embedding(key: bytes, embedding: np.ndarray) -> None:
+    """Index a query embedding so semantically equivalent queries can reuse its results."""
+    global _semantic_matrix
+    norm = np.linalg.norm(embedding)
+    if not norm:
+        return
+    
+    with _cache_lock:
+        _semantic_embeddings[key] = np.asarray(embedding, dtype=np.float32) / norm
+        _semantic_embeddings.move_to_end(key)
+        if len(_semantic_embeddings) > RESULT_CACHE.maxsize:
+            _semantic_embeddings.popitem(last=False)
+        _semantic_matrix = None
+
+
+def find_similar_query(embedding: np.ndarray, threshold: float) -> Optional[bytes]:
+    """Return the key of the most similar indexed query at or above the cosine threshold."""
+    global _semantic_matrix, _semantic_keys
+    norm = np.linalg.norm(embedding)
+    if not norm:
+        return None
+    
+    with _cache_lock:
+        if not _semantic_embeddings:
+            return None
+        if _semantic_matrix is None:
+            _semantic_keys = list(_semantic_embeddings)
+            _semantic_matrix = np.stack(list(_semantic_embeddings.values()))
+        matrix, keys = _semantic_matrix, _semantic_keys
+    
+    # One (K, d) @ (d,) product scores every indexed query
+    similarities = matrix @ (np.asarray(embedding, dtype=np.float32) / norm)
+    best = int(np.argmax(similarities))
+    return keys[best] if similarities[best] >= threshold else None
+
+
+def clear_result_cache() -> None:
+    """Drop cached search results. Call whenever the collection changes."""
+    global _semantic_matrix, _collection_version
+    with _cache_lock:
+        RESULT_CACHE.clear()
+        _semantic_embeddings.clear()
+        _semantic_matrix = None
+        _collection_version += 1
+
+
+def get_collection_version() -> int:
+    """Return a counter that changes whenever the collection is written."""
+    return _collection_version
@@ -0,0 +1,82 @@
+"""
+Content-addressed on-disk embedding cache for the AI Student Support Service.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+import numpy as np
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class EmbeddingStore:
+    """SQLite-backed cache mapping hash(model revision, text) to an embedding vector."""
+
+    def __init__(self, directory: str, model_revision: str, precision: str = "float16") -> None:
+        """Open (or create) the cache database under the given directory."""
+        os.makedirs(directory, exist_ok=True)
+        # float16 halves the cache footprint; the precision is part of the key so rows never mix
+        self._dtype = np.dtype(precision)
+        self._key_prefix = f"{model_revision}\0{self._dtype.name}\0".encode()
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            os.path.join(directory, "embeddings.sqlite3"),
+            check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._connection.commit()
+
+    def make_key(self, text: str) -> bytes:
+        """Hash text together with the model revision so model upgrades miss cleanly."""
+        return hashlib.blake2b(self._key_prefix + text.encode(), digest_size=16).digest()
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, np.ndarray]:
+        """Return cached vectors for whichever keys are present."""
+        if not keys:
+            return {}
+
+        found: Dict[bytes, np.ndarray] = {}
+        unique_keys = list(dict.fromkeys(keys))
+        with self._lock:
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(unique_keys), 500):
+                batch = unique_keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._connection.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, vector in rows:
+                    found[key] = np.frombuffer(vector, dtype=self._dtype).astype(np.float32)
+        return found
+
+    def put_many(self, items: Dict[bytes, np.ndarray]) -> None:
+        """Store vectors packed at the configured precision."""
+        if not items:
+            return
+
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, np.asarray(vector, dtype=self._dtype).tobytes()) for key, vector in items.items()]
+            )
+            self._connection.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._connection.close()
+
+
+def open_embedding_store(directory: str, model_revision: str, precision: str = "float16") -> Optional[EmbeddingStore]:
+    """Open the embedding store, returning None (cache disabled) if it can't be created."""
+    try:
+        return EmbeddingStore(directory, model_revision, precision)
+    except (OSError, sqlite3.Error, TypeError) as e:
+        logger.warning(f"Embedding cache disabled: {e}")
+        return None
@@ -1,8 +1,9 @@
 """
 Custom exception handler for standardized error responses.
 """
+import orjson
 from fastapi import Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from app.models.base import ErrorResponse
@@ -10,53 +11,56 @@ from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Static error bodies, serialized once at import time
+_VALIDATION_ERROR_BODY = orjson.dumps(ErrorResponse(
+    success=False,
+    message="Request validation failed",
+    error="Invalid request data provided",
+    error_code="VALIDATION_ERROR"
+).model_dump())
+
+_INTERNAL_ERROR_BODY = orjson.dumps(ErrorResponse(
+    success=False,
+    message="Internal server error",
+    error="An unexpected error occurred",
+    error_code="INTERNAL_ERROR"
+).model_dump())
+
+# HTTP errors only vary in error/error_code
+_HTTP_ERROR_TEMPLATE = {"success": False, "message": "Request failed"}
+
 
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle validation errors with standardized response format."""
-    logger.warning(f"Validation error: {exc.errors()}")
-    
-    error_response = ErrorResponse(
-        success=False,
-        message="Request validation failed",
-        error="Invalid request data provided",
-        error_code="VALIDATION_ERROR"
-    )
+    logger.warning("Validation error: %s", exc.errors())
     
-    return JSONResponse(
+    return Response(
+        content=_VALIDATION_ERROR_BODY,
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-        content=error_response.model_dump()
+        media_type="application/json"
     )
 
 
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     """Handle HTTP exceptions with standardized response format."""
-    logger.warning(f"HTTP exception: {exc.status_code} - {exc.detail}")
+    logger.warning("HTTP exception: %s - %s", exc.status_code, exc.detail)
     
-    error_response = ErrorResponse(
-        success=False,
-        message="Request failed",
-        error=str(exc.detail),
-        error_code=f"HTTP_{exc.status_code}"
-    )
+    error_response = dict(_HTTP_ERROR_TEMPLATE, error=str(exc.detail), error_code=f"HTTP_{exc.status_code}")
     
-    return JSONResponse(
+    # Keep headers such as Allow (405) or WWW-Authenticate (401) that Starlette's own handler sends
+    return ORJSONResponse(
+        content=error_response,
         status_code=exc.status_code,
-        content=error_response.model_dump()
+        headers=getattr(exc, "headers", None)
     )
 
 
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle general exceptions with standardized response format."""
-    logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    
-    error_response = ErrorResponse(
-        success=False,
-        message="Internal server error",
-        error="An unexpected error occurred",
-        error_code="INTERNAL_ERROR"
-    )
+    logger.error("Unhandled exception: %s", exc, exc_info=True)
     
-    return JSONResponse(
+    return Response(
+        content=_INTERNAL_ERROR_BODY,
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content=error_response.model_dump()
+        media_type="application/json"
     )
@@ -4,11 +4,12 @@ Provides consistent logging with colored output and service prefixing.
 """
 import logging
 import sys
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from colorama import Fore, Style, init
 
-# Initialize colorama for cross-platform colored output
-init(autoreset=True)
+# colorama is only needed to translate ANSI codes on Windows consoles
+if sys.platform == "win32":
+    init(autoreset=True)
 
 class ColoredFormatter(logging.Formatter):
     """Custom formatter with colored output for different log levels."""
@@ -21,20 +22,39 @@ class ColoredFormatter(logging.Formatter):
         'CRITICAL': Fore.MAGENTA + Style.BRIGHT
     }
     
+    # Colored strings built once instead of concatenated per record
+    COLORED_LEVELS = {level: f"{color}{level}{Style.RESET_ALL}" for level, color in COLORS.items()}
+    _colored_prefixes: Dict[str, str] = {}
+    
     def format(self, record):
         # Add service prefix if not already present
-        if not hasattr(record, 'service_prefix'):
-            record.service_prefix = 'ai-service'
+        prefix = getattr(record, 'service_prefix', 'ai-service')
         
         # Format the message with colors
-        color = self.COLORS.get(record.levelname, '')
-        record.levelname = f"{color}{record.levelname}{Style.RESET_ALL}"
+        record.levelname = self.COLORED_LEVELS.get(record.levelname, record.levelname)
         
         # Format the service prefix
-        record.service_prefix = f"{Fore.BLUE}[{record.service_prefix}]{Style.RESET_ALL}"
+        colored_prefix = self._colored_prefixes.get(prefix)
+        if colored_prefix is None:
+            colored_prefix = self._colored_prefixes[prefix] = f"{Fore.BLUE}[{prefix}]{Style.RESET_ALL}"
+        record.service_prefix = colored_prefix
         
         return super().format(record)
 
+class _PrefixFilter(logging.Filter):
+    """Stamp each record with the service prefix so no LoggerAdapter sits on the call path."""
+    
+    def __init__(self, prefix: str) -> None:
+        super().__init__()
+        self.prefix = prefix
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.service_prefix = self.prefix
+        return True
+
+# Loggers already configured by get_logger, keyed by (name, service_prefix)
+_loggers: Dict[Tuple[str, str], logging.Logger] = {}
+
 def setup_logger(
     name: str,
     level: int = logging.INFO,
@@ -62,10 +82,12 @@ def setup_logger(
         return logger
     
     logger.setLevel(level)
+    prefix_filter = _PrefixFilter(service_prefix)
     
     # Create console handler with colored output
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(level)
+    console_handler.addFilter(prefix_filter)
     
     # Create formatter
     formatter = ColoredFormatter(
@@ -80,6 +102,7 @@ def setup_logger(
     if log_to_file and log_file_path:
         file_handler = logging.FileHandler(log_file_path)
         file_handler.setLevel(level)
+        file_handler.addFilter(prefix_filter)
         
         # File formatter without colors
         file_formatter = logging.Formatter(
@@ -89,9 +112,6 @@ def setup_logger(
         file_handler.setFormatter(file_formatter)
         logger.addHandler(file_handler)
     
-    # Add service prefix to log records
-    logger = logging.LoggerAdapter(logger, {'service_prefix': service_prefix})
-    
     return logger
 
 def get_logger(
@@ -108,7 +128,11 @@ def get_logger(
     Returns:
         Configured logger instance
     """
-    return setup_logger(name, service_prefix=service_prefix)
+    key = (name, service_prefix)
+    logger = _loggers.get(key)
+    if logger is None:
+        logger = _loggers[key] = setup_logger(name, service_prefix=service_prefix)
+    return logger
 
 # Global logger instance for the main application
 app_logger = get_logger("ai-student-support-svc")
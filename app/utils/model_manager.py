@@ -3,6 +3,7 @@ Model management utility for embedding models.
 """
 import os
 import asyncio
+import shutil
 from typing import Optional, Dict, Any
 from sentence_transformers import SentenceTransformer
 from app.config.settings import get_settings
@@ -10,6 +11,10 @@ from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Process-wide model instance; loaded once by ensure_model_available
+_MODEL_SINGLETON: Optional[SentenceTransformer] = None
+_model_lock = asyncio.Lock()
+
 
 class ModelManager:
     """Manages embedding model downloads, caching, and availability."""
@@ -34,16 +39,9 @@ class ModelManager:
             local_available = os.path.exists(local_cache_path)
             hf_available = os.path.exists(hf_cache_path)
             
-            # Try to load model
-            model_loaded = False
+            # Report the loaded singleton rather than constructing a model per status poll
+            model_loaded = _MODEL_SINGLETON is not None
             model_error = None
-            try:
-                if local_available or hf_available:
-                    model = SentenceTransformer(model_name, cache_folder=self.model_cache_dir)
-                    model_loaded = True
-                    del model  # Clean up
-            except Exception as e:
-                model_error = str(e)
             
             return {
                 "model_name": model_name,
@@ -65,31 +63,25 @@ class ModelManager:
             }
     
     async def ensure_model_available(self, force_download: bool = False) -> Optional[SentenceTransformer]:
-        """Ensure embedding model is available, downloading if necessary."""
+        """Ensure embedding model is available, downloading if necessary. Returns the process-wide instance."""
+        global _MODEL_SINGLETON
         try:
             model_name = self.settings.embedding_model
             
-            # Check if model is already available
-            if not force_download:
-                try:
-                    model = SentenceTransformer(model_name, cache_folder=self.model_cache_dir)
-                    logger.info(f"Model {model_name} loaded from cache")
-                    return model
-                except Exception as e:
-                    logger.info(f"Model not in cache: {e}")
-            
-            # Download the model
-            logger.info(f"Downloading model: {model_name}")
-            logger.info("This may take several minutes on first run...")
-            
-            # Download with progress tracking
-            model = SentenceTransformer(
-                model_name,
-                cache_folder=self.model_cache_dir
-            )
-            
-            logger.info(f"Model {model_name} downloaded successfully")
-            return model
+            async with _model_lock:
+                if _MODEL_SINGLETON is not None and not force_download:
+                    return _MODEL_SINGLETON
+                
+                # Loads from cache when present, otherwise downloads (may take several minutes on first run)
+                logger.info(f"Loading model: {model_name}")
+                _MODEL_SINGLETON = await asyncio.to_thread(
+                    SentenceTransformer,
+                    model_name,
+                    cache_folder=self.model_cache_dir
+                )
+                
+                logger.info(f"Model {model_name} loaded successfully")
+                return _MODEL_SINGLETON
             
         except Exception as e:
             logger.error(f"Failed to ensure model availability: {e}")
@@ -98,41 +90,38 @@ class ModelManager:
     def cleanup_old_models(self, keep_recent: int = 2) -> Dict[str, Any]:
         """Clean up old model versions to save disk space."""
         try:
-            cleaned_models = []
             total_space_saved = 0
             
-            # List all cached models
+            # List all cached models with their mtimes in one scandir pass
+            cached_models = []
             if os.path.exists(self.model_cache_dir):
-                for item in os.listdir(self.model_cache_dir):
-                    item_path = os.path.join(self.model_cache_dir, item)
-                    if os.path.isdir(item_path):
-                        # Get directory size
-                        size = self._get_directory_size(item_path)
-                        cleaned_models.append({
-                            "name": item,
-                            "size_mb": round(size / (1024 * 1024), 2),
-                            "path": item_path
-                        })
+                with os.scandir(self.model_cache_dir) as entries:
+                    cached_models = [
+                        (entry.name, entry.path, entry.stat(follow_symlinks=False).st_mtime)
+                        for entry in entries
+                        if entry.is_dir(follow_symlinks=False)
+                    ]
             
             # Sort by modification time (newest first)
-            cleaned_models.sort(key=lambda x: os.path.getmtime(x["path"]), reverse=True)
+            cached_models.sort(key=lambda model: model[2], reverse=True)
             
-            # Remove old models (keep the most recent ones)
-            for model_info in cleaned_models[keep_recent:]:
+            # Remove old models (keep the most recent ones); only evicted models are sized
+            stale_models = cached_models[keep_recent:]
+            for name, path, _ in stale_models:
                 try:
-                    import shutil
-                    shutil.rmtree(model_info["path"])
-                    total_space_saved += model_info["size_mb"]
-                    logger.info(f"Cleaned up old model: {model_info['name']} ({model_info['size_mb']} MB)")
+                    size_mb = round(self._get_directory_size(path) / (1024 * 1024), 2)
+                    shutil.rmtree(path)
+                    total_space_saved += size_mb
+                    logger.info(f"Cleaned up old model: {name} ({size_mb} MB)")
                 except Exception as e:
-                    logger.warning(f"Failed to clean up model {model_info['name']}: {e}")
+                    logger.warning(f"Failed to clean up model {name}: {e}")
             
             return {
                 "status": "success",
-                "models_cleaned": len(cleaned_models) - keep_recent,
+                "models_cleaned": len(stale_models),
                 "space_saved_mb": round(total_space_saved, 2),
                 "models_kept": keep_recent,
-                "total_models_found": len(cleaned_models)
+                "total_models_found": len(cached_models)
             }
             
         except Exception as e:
@@ -144,16 +133,21 @@ class ModelManager:
     
     def _get_directory_size(self, path: str) -> int:
         """Calculate directory size in bytes."""
-        total_size = 0
-        try:
-            for dirpath, dirnames, filenames in os.walk(path):
-                for filename in filenames:
-                    filepath = os.path.join(dirpath, filename)
-                    if os.path.exists(filepath):
-                        total_size += os.path.getsize(filepath)
-        except Exception:
-            pass
-        return total_size
+        def file_sizes(directory: str):
+            # scandir reuses the dirent type and stats each file once; symlinks (HF snapshot
+            # links into blobs/) are skipped so shared blobs aren't counted twice
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_file(follow_symlinks=False):
+                            yield entry.stat(follow_symlinks=False).st_size
+                        elif entry.is_dir(follow_symlinks=False):
+                            yield from file_sizes(entry.path)
+            except OSError:
+                # Unreadable or vanished directory: count what we could see, like os.walk did
+                return
+        
+        return sum(file_sizes(path))
     
     def get_disk_usage(self) -> Dict[str, Any]:
         """Get disk usage information for model cache."""
@@ -170,7 +164,6 @@ class ModelManager:
             cache_size = self._get_directory_size(self.model_cache_dir)
             
             # Get free disk space
-            import shutil
             total, used, free = shutil.disk_usage(self.model_cache_dir)
             
             return {
@@ -191,18 +184,14 @@ class ModelManager:
     async def health_check(self) -> Dict[str, Any]:
         """Perform a comprehensive health check of the model system."""
         try:
-            # Get model status
-            model_status = self.get_model_status()
+            # Load first: status reports the singleton, so it must be read after the model check
+            model_working = await self.ensure_model_available() is not None
             
-            # Get disk usage
-            disk_usage = self.get_disk_usage()
-            
-            # Try to load model
-            model_test = await self.ensure_model_available()
-            model_working = model_test is not None
-            
-            if model_test:
-                del model_test  # Clean up
+            # Status and disk usage (directory walks) run side by side in threads
+            model_status, disk_usage = await asyncio.gather(
+                asyncio.to_thread(self.get_model_status),
+                asyncio.to_thread(self.get_disk_usage)
+            )
             
             return {
                 "status": "healthy" if model_working else "degraded",
@@ -0,0 +1,111 @@
+"""
+ONNX Runtime embedding backend for the AI Student Support Service.
+"""
+import os
+import shutil
+import tempfile
+from typing import List, Optional, Union
+import numpy as np
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+    logger.info("optimum[onnxruntime] not available. Embeddings will use the PyTorch backend.")
+
+# File written by ORTQuantizer for the dynamically quantized model
+QUANTIZED_MODEL_FILE = "model_quantized.onnx"
+
+# Quantized exports live with the other cached models, not in the vector store's data directory
+ONNX_MODEL_CACHE_DIRECTORY = "./model_cache/onnx_models"
+
+
+class OnnxEmbeddingModel:
+    """Int8-quantized ONNX sentence embedder exposing the SentenceTransformer.encode interface."""
+
+    def __init__(self, model_name: str, cache_directory: str, token: Optional[str] = None) -> None:
+        """Export and quantize the model once, then load the quantized session."""
+        if not ONNX_AVAILABLE:
+            raise RuntimeError("ONNX embedding backend requires optimum[onnxruntime]")
+
+        # SentenceTransformer resolves bare names against the sentence-transformers org
+        model_id = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+        quantized_dir = os.path.join(cache_directory, model_id.replace("/", "__"))
+
+        if not os.path.exists(os.path.join(quantized_dir, QUANTIZED_MODEL_FILE)):
+            self._export_quantized(model_id, quantized_dir, token)
+
+        self.tokenizer = AutoTokenizer.from_pretrained(quantized_dir)
+        self.model = ORTModelForFeatureExtraction.from_pretrained(
+            quantized_dir,
+            file_name=QUANTIZED_MODEL_FILE,
+            provider="CPUExecutionProvider"
+        )
+
+    @staticmethod
+    def _export_quantized(model_id: str, quantized_dir: str, token: Optional[str]) -> None:
+        """Export and quantize into a scratch directory, then rename it into place.
+
+        Concurrent workers each build their own copy; the first rename wins and the rest are discarded.
+        """
+        logger.info(f"Exporting and quantizing {model_id} to ONNX int8")
+        parent = os.path.dirname(quantized_dir)
+        os.makedirs(parent, exist_ok=True)
+        scratch_dir = tempfile.mkdtemp(prefix=".export-", dir=parent)
+        try:
+            exported = ORTModelForFeatureExtraction.from_pretrained(model_id, export=True, token=token)
+            quantizer = ORTQuantizer.from_pretrained(exported)
+            quantizer.quantize(
+                save_dir=scratch_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            )
+            AutoTokenizer.from_pretrained(model_id, token=token).save_pretrained(scratch_dir)
+            try:
+                os.rename(scratch_dir, quantized_dir)
+            except OSError:
+                if not os.path.exists(os.path.join(quantized_dir, QUANTIZED_MODEL_FILE)):
+                    raise
+                logger.info(f"ONNX export of {model_id} already written by another process")
+        finally:
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = False,
+        show_progress_bar: bool = False
+    ) -> np.ndarray:
+        """Embed one text or a list of texts. Mean-pooled and L2-normalized like the SBERT models."""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+
+        # Sort by length so each batch pads only to similar-length neighbours, then restore order
+        order = np.argsort([-len(text) for text in texts], kind="stable")
+        embeddings = np.empty((len(texts), self.model.config.hidden_size), dtype=np.float32)
+
+        for start in range(0, len(texts), batch_size):
+            batch_indices = order[start:start + batch_size]
+            encoded = self.tokenizer(
+                [texts[i] for i in batch_indices],
+                padding=True,
+                truncation=True,
+                return_tensors="np"
+            )
+            token_embeddings = np.asarray(self.model(**encoded).last_hidden_state, dtype=np.float32)
+
+            # Mean pooling over non-padding tokens without materializing the masked (B, T, d) product
+            mask = encoded["attention_mask"].astype(np.float32)
+            pooled = np.einsum("btd,bt->bd", token_embeddings, mask)
+            pooled /= mask.sum(axis=1, keepdims=True).clip(min=1)
+            pooled /= np.linalg.norm(pooled, axis=1, keepdims=True).clip(min=1e-12)
+            embeddings[batch_indices] = pooled
+
+        return embeddings[0] if single else embeddings
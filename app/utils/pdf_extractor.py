@@ -1,103 +1,186 @@
 """
 PDF text extraction utility for the AI Student Support-svc.
 """
-import io
-from typing import Optional
+import mmap
+import re
+from typing import List, Optional
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Every PDF starts with this header; uploads are checked against it before extraction
+PDF_MAGIC = b"%PDF-"
+
+# Runs of whitespace other than newlines, and newlines with any surrounding whitespace
+_INLINE_WHITESPACE = re.compile(r'[^\S\n]+')
+_LINE_BREAKS = re.compile(r'\s*\n\s*')
+
 try:
-    from PyPDF2 import PdfReader
+    from PyPDF2 import PageObject, PdfReader
     PDF_AVAILABLE = True
 except ImportError:
     PDF_AVAILABLE = False
     logger.warning("PyPDF2 not available. PDF extraction will be limited.")
 
+try:
+    # PyMuPDF's C parser; installed alongside pymupdf4llm
+    import fitz
+    FITZ_AVAILABLE = True
+except ImportError:
+    FITZ_AVAILABLE = False
+    logger.info("PyMuPDF not available. Plain-text extraction will use PyPDF2.")
+
+try:
+    import pymupdf4llm
+    MARKDOWN_AVAILABLE = True
+except ImportError:
+    MARKDOWN_AVAILABLE = False
+    logger.info("pymupdf4llm not available. PDFs will be extracted as plain text.")
+
 
 class PDFExtractor:
     """Utility class for extracting text from PDF files."""
     
     @staticmethod
-    def extract_text_from_bytes(pdf_bytes: bytes) -> Optional[str]:
-        """Extract text from PDF bytes with error handling."""
+    def extract_text_from_file(pdf_path: str, pages: Optional[List[int]] = None) -> Optional[str]:
+        """Extract text from a PDF file on disk (optionally only the given 0-based pages) without loading it fully into memory."""
+        if FITZ_AVAILABLE:
+            try:
+                with fitz.open(pdf_path) as document:
+                    return PDFExtractor._extract_fitz_text(document, pages)
+            except Exception as e:
+                logger.warning(f"PyMuPDF failed on PDF file {pdf_path}, falling back to PyPDF2: {e}")
+        
         if not PDF_AVAILABLE:
             logger.error("PDF extraction not available - PyPDF2 not installed")
             return None
             
         try:
-            # Create PDF reader from bytes
-            pdf_stream = io.BytesIO(pdf_bytes)
-            pdf_reader = PdfReader(pdf_stream)
+            # Memory-map the file: PdfReader's many small seeks/reads become page-cache
+            # lookups instead of syscalls, and pages are only faulted in as they're parsed
+            with open(pdf_path, "rb") as pdf_file, mmap.mmap(pdf_file.fileno(), 0, access=mmap.ACCESS_READ) as pdf_stream:
+                return PDFExtractor._extract_text(PdfReader(pdf_stream), pages)
             
-            # Extract text from all pages
-            text_parts = []
-            for page_num, page in enumerate(pdf_reader.pages):
-                try:
-                    page_text = page.extract_text()
-                    if page_text.strip():
-                        text_parts.append(page_text.strip())
-                except Exception as e:
-                    logger.warning(f"Failed to extract text from page {page_num + 1}: {e}")
-                    continue
+        except Exception as e:
+            logger.error(f"Failed to extract text from PDF file {pdf_path}: {e}")
+            return None
+    
+    @staticmethod
+    def extract_markdown_from_file(pdf_path: str, pages: Optional[List[int]] = None) -> Optional[str]:
+        """Convert a PDF file on disk (optionally only the given 0-based pages) to Markdown, preserving headings."""
+        if not MARKDOWN_AVAILABLE:
+            return None
+        
+        try:
+            markdown_text = pymupdf4llm.to_markdown(pdf_path, pages=pages)
             
-            if not text_parts:
-                logger.warning("No text could be extracted from PDF")
+            if not markdown_text or not markdown_text.strip():
+                logger.warning("No text could be extracted from PDF as Markdown")
                 return None
             
-            # Combine all text parts
-            full_text = "\n\n".join(text_parts)
-            
-            # Clean up text
-            cleaned_text = PDFExtractor._clean_text(full_text)
-            
-            logger.info(f"Successfully extracted {len(cleaned_text)} characters from PDF")
-            return cleaned_text
+            logger.info(f"Successfully extracted {len(markdown_text)} characters of Markdown from PDF")
+            return markdown_text.strip()
             
         except Exception as e:
-            logger.error(f"Failed to extract text from PDF bytes: {e}")
+            logger.error(f"Failed to extract Markdown from PDF file {pdf_path}: {e}")
             return None
     
     @staticmethod
-    def _clean_text(text: str) -> str:
-        """Clean extracted text by removing excessive whitespace and formatting."""
-        if not text:
-            return ""
+    def count_pages(pdf_path: str) -> int:
+        """Return the page count of a PDF file, or 0 if it can't be read."""
+        try:
+            if FITZ_AVAILABLE:
+                with fitz.open(pdf_path) as document:
+                    return document.page_count
+            if PDF_AVAILABLE:
+                with open(pdf_path, "rb") as pdf_file:
+                    return len(PdfReader(pdf_file).pages)
+        except Exception as e:
+            logger.warning(f"Failed to count pages of PDF file {pdf_path}: {e}")
+        return 0
+    
+    @staticmethod
+    def _extract_text(pdf_reader: "PdfReader", pages: Optional[List[int]] = None) -> Optional[str]:
+        """Extract and clean text from the given (default: all) pages of an open PDF reader."""
+        # Extract text from all pages
+        text_parts = []
+        for page_num in pages if pages is not None else range(len(pdf_reader.pages)):
+            try:
+                page = pdf_reader.pages[page_num]
+                # Scanned/image-only pages have no fonts; skip parsing their (often huge) content streams
+                if not PDFExtractor._page_has_fonts(page):
+                    continue
+                page_text = page.extract_text()
+                if page_text.strip():
+                    text_parts.append(page_text.strip())
+            except Exception as e:
+                logger.warning(f"Failed to extract text from page {page_num + 1}: {e}")
+                continue
         
-        # Remove excessive whitespace
-        lines = text.split('\n')
-        cleaned_lines = []
+        return PDFExtractor._combine_pages(text_parts)
+    
+    @staticmethod
+    def _page_has_fonts(page: "PageObject") -> bool:
+        """Check whether a PyPDF2 page (or a Form XObject it draws) declares any font resources."""
+        resources = page.get("/Resources")
+        if resources is None:
+            return False
+        resources = resources.get_object()
+        if resources.get("/Font"):
+            return True
+        
+        # Text can live inside Form XObjects that carry their own /Resources
+        xobjects = resources.get("/XObject")
+        if not xobjects:
+            return False
+        return any(
+            xobject.get_object().get("/Subtype") == "/Form"
+            for xobject in xobjects.get_object().values()
+        )
+    
+    @staticmethod
+    def _extract_fitz_text(document: "fitz.Document", pages: Optional[List[int]] = None) -> Optional[str]:
+        """Extract and clean text from the given (default: all) pages of an open PyMuPDF document."""
+        text_parts = []
+        for page_num in pages if pages is not None else range(document.page_count):
+            try:
+                page = document[page_num]
+                # get_fonts also lists fonts used by the page's Form XObjects
+                if not page.get_fonts():
+                    continue
+                page_text = page.get_text("text")
+                if page_text.strip():
+                    text_parts.append(page_text.strip())
+            except Exception as e:
+                logger.warning(f"Failed to extract text from page {page_num + 1}: {e}")
+                continue
         
-        for line in lines:
-            # Clean each line
-            cleaned_line = ' '.join(line.split())
-            if cleaned_line:
-                cleaned_lines.append(cleaned_line)
+        return PDFExtractor._combine_pages(text_parts)
+    
+    @staticmethod
+    def _combine_pages(text_parts: List[str]) -> Optional[str]:
+        """Join per-page text and clean it."""
+        if not text_parts:
+            logger.warning("No text could be extracted from PDF")
+            return None
         
-        # Join lines with proper spacing
-        cleaned_text = '\n'.join(cleaned_lines)
+        # Combine all text parts
+        full_text = "\n\n".join(text_parts)
         
-        # Remove multiple consecutive newlines
-        while '\n\n\n' in cleaned_text:
-            cleaned_text = cleaned_text.replace('\n\n\n', '\n\n')
+        # Clean up text
+        cleaned_text = PDFExtractor._clean_text(full_text)
         
-        return cleaned_text.strip()
+        logger.info(f"Successfully extracted {len(cleaned_text)} characters from PDF")
+        return cleaned_text
     
     @staticmethod
-    def is_valid_pdf(pdf_bytes: bytes) -> bool:
-        """Check if bytes represent a valid PDF file."""
-        if not PDF_AVAILABLE:
-            return pdf_bytes.startswith(b'%PDF')
-            
-        try:
-            # Check if it starts with PDF magic number
-            if pdf_bytes.startswith(b'%PDF'):
-                return True
-            
-            # Try to read as PDF
-            pdf_stream = io.BytesIO(pdf_bytes)
-            PdfReader(pdf_stream)
-            return True
-            
-        except Exception:
-            return False
+    def _clean_text(text: str) -> str:
+        """Clean extracted text by removing excessive whitespace and formatting."""
+        if not text:
+            return ""
+        
+        # Collapse whitespace within lines, then drop blank lines and the edges around each newline
+        cleaned_text = _INLINE_WHITESPACE.sub(' ', text)
+        cleaned_text = _LINE_BREAKS.sub('\n', cleaned_text)
+        
+        return cleaned_text.strip()
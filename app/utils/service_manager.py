@@ -2,66 +2,93 @@
 Global service manager for the AI Student Support Service.
 This module manages global service instances to avoid circular imports.
 """
-from typing import Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, NamedTuple, Optional, Protocol, runtime_checkable
 from app.utils.logger import get_logger
 
-# Import service types for type hints
-from app.services.ai_service import AIService
-from app.services.rag_service import RAGService
-from app.services.chroma_service import ChromaService
+if TYPE_CHECKING:
+    from app.services.ai_service import AIService
+    from app.services.chroma_service import ChromaService
+    from app.services.rag_service import RAGService
 
 logger = get_logger(__name__)
 
-# Global service instances with proper types
-_ai_service: Optional[AIService] = None
-_rag_service: Optional[RAGService] = None
-_chroma_service: Optional[ChromaService] = None
 
+@runtime_checkable
+class StatusReporter(Protocol):
+    """Interface every registered service implements for status reporting."""
+    
+    def is_available(self) -> bool: ...
+    
+    def get_status(self) -> Dict[str, Any]: ...
 
-def set_global_services(ai_service: AIService, rag_service: RAGService, chroma_service: ChromaService) -> None:
+
+class Services(NamedTuple):
+    """Immutable snapshot of the registered services; unpacks as (ai, rag, chroma)."""
+    ai: Optional["AIService"]
+    rag: Optional["RAGService"]
+    chroma: Optional["ChromaService"]
+
+
+# Replaced as a whole in set_global_services, so readers always see a consistent set
+_services = Services(None, None, None)
+
+
+def set_global_services(ai_service: "AIService", rag_service: "RAGService", chroma_service: "ChromaService") -> None:
     """Set the global service instances."""
-    global _ai_service, _rag_service, _chroma_service
-    _ai_service = ai_service
-    _rag_service = rag_service
-    _chroma_service = chroma_service
+    # Checked once here so request handlers can call get_status() without probing
+    for service in (ai_service, rag_service, chroma_service):
+        if not isinstance(service, StatusReporter):
+            raise TypeError(f"{type(service).__name__} does not implement StatusReporter")
+    
+    global _services
+    _services = Services(ai_service, rag_service, chroma_service)
     logger.info("Global services set successfully")
 
 
-def get_global_services() -> Tuple[AIService, RAGService, ChromaService]:
+def get_global_services() -> Services:
     """Get the global service instances."""
-    return _ai_service, _rag_service, _chroma_service
+    return _services
+
+
+async def services_dep() -> Services:
+    """FastAPI dependency for the global services. Async so it resolves without a threadpool hop."""
+    return _services
 
 
 def is_services_initialized() -> bool:
     """Check if all services are initialized."""
-    return all([_ai_service, _rag_service, _chroma_service])
+    return all(_services)
 
 
-def get_ai_service() -> Optional[AIService]:
+def get_ai_service() -> Optional["AIService"]:
     """Get the AI service instance."""
-    return _ai_service
+    return _services.ai
 
 
-def get_rag_service() -> Optional[RAGService]:
+def get_rag_service() -> Optional["RAGService"]:
     """Get the RAG service instance."""
-    return _rag_service
+    return _services.rag
 
 
-def get_chroma_service() -> Optional[ChromaService]:
+def get_chroma_service() -> Optional["ChromaService"]:
     """Get the ChromaDB service instance."""
-    return _chroma_service
+    return _services.chroma
 
 
+# Availability is checked live: the model or ChromaDB can drop out after startup
 def is_ai_service_available() -> bool:
     """Check if AI service is available and ready."""
-    return _ai_service is not None and hasattr(_ai_service, 'is_available') and _ai_service.is_available()
+    ai_service = _services.ai
+    return ai_service is not None and ai_service.is_available()
 
 
 def is_rag_service_available() -> bool:
     """Check if RAG service is available and ready."""
-    return _rag_service is not None and hasattr(_rag_service, 'is_available') and _rag_service.is_available()
+    rag_service = _services.rag
+    return rag_service is not None and rag_service.is_available()
 
 
 def is_chroma_service_available() -> bool:
     """Check if ChromaDB service is available and ready."""
-    return _chroma_service is not None and hasattr(_chroma_service, 'is_available') and _chroma_service.is_available()
+    chroma_service = _services.chroma
+    return chroma_service is not None and chroma_service.is_available()
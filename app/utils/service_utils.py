@@ -1,17 +1,26 @@
 """
 Utility functions for service management.
 """
+import asyncio
+from typing import TYPE_CHECKING, Any, Dict, Optional
 from fastapi import HTTPException
-from app.services.ai_service import AIService
-from app.services.rag_service import RAGService
-from app.services.chroma_service import ChromaService
 from app.utils.logger import get_logger
+from app.utils.service_manager import StatusReporter
+
+if TYPE_CHECKING:
+    from app.services.ai_service import AIService
+    from app.services.chroma_service import ChromaService
+    from app.services.rag_service import RAGService
 
 logger = get_logger(__name__)
 
 
-def get_services() -> tuple[AIService, RAGService, ChromaService]:
+def get_services() -> tuple["AIService", "RAGService", "ChromaService"]:
     """Get initialized service instances with error handling."""
+    from app.services.ai_service import AIService
+    from app.services.chroma_service import ChromaService
+    from app.services.rag_service import RAGService
+    
     try:
         # Initialize services
         ai_service = AIService()
@@ -26,3 +35,18 @@ def get_services() -> tuple[AIService, RAGService, ChromaService]:
     except Exception as e:
         logger.error(f"Failed to initialize services: {e}")
         raise HTTPException(status_code=503, detail="Service initialization failed")
+
+
+async def _probe_status(service: StatusReporter) -> Dict[str, Any]:
+    """Run a service's get_status() in a worker thread, capturing errors."""
+    try:
+        return await asyncio.to_thread(service.get_status)
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+
+async def probe_services_status(services: Dict[str, Optional[StatusReporter]]) -> Dict[str, Dict[str, Any]]:
+    """Probe all given services concurrently. Returns status dicts keyed by service name."""
+    probed = {name: service for name, service in services.items() if service}
+    statuses = await asyncio.gather(*(_probe_status(service) for service in probed.values()))
+    return dict(zip(probed.keys(), statuses))
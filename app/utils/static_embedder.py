@@ -0,0 +1,54 @@
+"""
+Static (Model2Vec-style) query embedding backend for the AI Student Support Service.
+"""
+import os
+from typing import Optional
+import numpy as np
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    from huggingface_hub import snapshot_download
+    from safetensors.numpy import load_file
+    from tokenizers import Tokenizer
+    STATIC_EMBEDDINGS_AVAILABLE = True
+except ImportError:
+    STATIC_EMBEDDINGS_AVAILABLE = False
+    logger.info("tokenizers/safetensors not available. Query embeddings will use the main embedding model.")
+
+# Files written by Model2Vec's StaticModel.save_pretrained
+STATIC_WEIGHTS_FILE = "model.safetensors"
+STATIC_TOKENIZER_FILE = "tokenizer.json"
+
+
+class StaticEmbeddingModel:
+    """Token-lookup embedder: mean of per-token static vectors, L2-normalized."""
+
+    def __init__(self, model_path: str, token: Optional[str] = None) -> None:
+        """Load a Model2Vec embedding table and tokenizer from a local directory or the Hub."""
+        if not STATIC_EMBEDDINGS_AVAILABLE:
+            raise RuntimeError("Static embedding backend requires tokenizers and safetensors")
+
+        if not os.path.isdir(model_path):
+            model_path = snapshot_download(
+                model_path,
+                allow_patterns=[STATIC_WEIGHTS_FILE, STATIC_TOKENIZER_FILE],
+                token=token
+            )
+
+        self.table = np.ascontiguousarray(
+            load_file(os.path.join(model_path, STATIC_WEIGHTS_FILE))["embeddings"], dtype=np.float32
+        )
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_path, STATIC_TOKENIZER_FILE))
+        self.dimension = self.table.shape[1]
+
+    def encode(self, text: str, convert_to_numpy: bool = True) -> np.ndarray:
+        """Embed a single text by averaging the static vectors of its tokens."""
+        ids = self.tokenizer.encode(text, add_special_tokens=False).ids
+        if not ids:
+            return np.zeros(self.dimension, dtype=np.float32)
+
+        vector = self.table[ids].mean(axis=0)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
@@ -2,12 +2,34 @@
 Text chunking utility for the AI Student Support Service.
 Splits documents into appropriate chunks for better RAG performance.
 """
+import itertools
 import re
-from typing import List, Dict, Any
+import secrets
+from collections import deque
+from typing import Any, Deque, Dict, List
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Markdown ATX heading line, e.g. "## Admission Requirements"
+MARKDOWN_HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.+?)\s*#*\s*$', re.MULTILINE)
+
+# Runs of whitespace or characters outside the chunker's allowed set; both become a single space
+SPECIAL_OR_WHITESPACE_PATTERN = re.compile(r'[^\w.,!?;:\-()\[\]{}]+')
+
+# Space left before punctuation once whitespace has been collapsed
+PUNCTUATION_SPACING_PATTERN = re.compile(r' ([.,!?;:])')
+
+# Sentence endings followed by whitespace and a capital letter
+SENTENCE_BOUNDARY_PATTERN = re.compile(r'(?<=[.!?])\s+(?=[A-Z])')
+
+# Characters of the document start stored with each chunk as context
+DOC_PREFIX_LENGTH = 600
+
+# Chunk ids are a random per-process prefix plus a counter; far cheaper than a uuid4 per chunk
+_CHUNK_ID_PREFIX = secrets.token_hex(8)
+_chunk_counter = itertools.count()
+
 
 class TextChunker:
     """Utility class for chunking text documents."""
@@ -18,7 +40,7 @@ class TextChunker:
         
         Args:
             chunk_size: Target size for each chunk in characters
-            chunk_overlap: Overlap between chunks in characters
+            chunk_overlap: Maximum length of the whole sentences carried over between chunks
         """
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
@@ -45,15 +67,17 @@ class TextChunker:
         sentences = self._split_into_sentences(cleaned_text)
         
         chunks = []
-        current_chunk = ""
+        # Sliding window of whole sentences and the length of their space-joined text
+        window: Deque[str] = deque()
+        window_length = 0
         chunk_id = 0
         
         for sentence in sentences:
             # Check if adding this sentence would exceed chunk size
-            if len(current_chunk) + len(sentence) > self.chunk_size and current_chunk:
+            if window_length + len(sentence) > self.chunk_size and window:
                 # Save current chunk
                 chunk_data = self._create_chunk_data(
-                    current_chunk.strip(), 
+                    " ".join(window).strip(), 
                     chunk_id, 
                     metadata,
                     len(chunks)
@@ -61,20 +85,19 @@ class TextChunker:
                 chunks.append(chunk_data)
                 chunk_id += 1
                 
-                # Start new chunk with overlap
-                if self.chunk_overlap > 0 and chunks:
-                    # Get last part of previous chunk for overlap
-                    overlap_text = current_chunk[-self.chunk_overlap:]
-                    current_chunk = overlap_text + " " + sentence
-                else:
-                    current_chunk = sentence
-            else:
-                current_chunk += " " + sentence if current_chunk else sentence
+                # Slide forward, keeping the trailing sentences that fit in the overlap and leave room for this one
+                while window and (window_length > self.chunk_overlap or window_length + len(sentence) >= self.chunk_size):
+                    dropped = window.popleft()
+                    window_length -= len(dropped) + 1 if window else len(dropped)
+            
+            window_length += len(sentence) + 1 if window else len(sentence)
+            window.append(sentence)
         
         # Add final chunk if there's content
-        if current_chunk.strip():
+        current_chunk = " ".join(window).strip()
+        if current_chunk:
             chunk_data = self._create_chunk_data(
-                current_chunk.strip(), 
+                current_chunk, 
                 chunk_id, 
                 metadata,
                 len(chunks)
@@ -84,59 +107,107 @@ class TextChunker:
         logger.info(f"Chunked text into {len(chunks)} chunks (target size: {self.chunk_size}, overlap: {self.chunk_overlap})")
         return chunks
     
+    def chunk_markdown(self, text: str, metadata: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        """
+        Split Markdown into chunks that respect its heading structure.
+        
+        Each section under a heading is chunked separately, its heading path
+        is prepended to the chunk content, and the heading path and start of
+        the document are stored in the chunk metadata.
+        
+        Args:
+            text: Markdown text to chunk
+            metadata: Original document metadata
+            
+        Returns:
+            List of chunk dictionaries with content and metadata
+        """
+        if not text or not text.strip():
+            logger.warning("Empty text provided for chunking")
+            return []
+        
+        metadata = dict(metadata or {})
+        doc_prefix = self._clean_text(text[:DOC_PREFIX_LENGTH])
+        
+        chunks = []
+        heading_stack: List[str] = []
+        
+        for heading_level, heading_text, body in self._split_markdown_sections(text):
+            if heading_text:
+                # Drop headings at the same or deeper level, then push this one
+                del heading_stack[heading_level - 1:]
+                heading_stack.extend([""] * (heading_level - 1 - len(heading_stack)))
+                heading_stack.append(heading_text)
+            
+            if not body.strip():
+                continue
+            
+            heading_path = " > ".join(heading for heading in heading_stack if heading)
+            section_metadata = dict(metadata)
+            section_metadata["heading"] = heading_path
+            section_metadata["prefix"] = doc_prefix
+            
+            for chunk in self.chunk_text(body, section_metadata):
+                if heading_path:
+                    chunk["content"] = f"{heading_path}\n{chunk['content']}"
+                    chunk["metadata"]["chunk_size"] = len(chunk["content"])
+                chunks.append(chunk)
+        
+        # Renumber so chunk ids are sequential across the whole document
+        for index, chunk in enumerate(chunks):
+            chunk["metadata"]["chunk_id"] = index
+            chunk["metadata"]["chunk_index"] = index
+        
+        logger.info(f"Chunked Markdown into {len(chunks)} structure-aware chunks")
+        return chunks
+    
+    def _split_markdown_sections(self, text: str) -> List[tuple]:
+        """Split Markdown into (heading_level, heading_text, body) sections."""
+        sections = []
+        last_end = 0
+        level, heading = 0, ""
+        
+        for match in MARKDOWN_HEADING_PATTERN.finditer(text):
+            sections.append((level, heading, text[last_end:match.start()]))
+            level, heading = len(match.group(1)), match.group(2).strip("*_ ")
+            last_end = match.end()
+        
+        sections.append((level, heading, text[last_end:]))
+        return sections
+    
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text."""
         if not text:
             return ""
         
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove special characters that might interfere with chunking
-        text = re.sub(r'[^\w\s\.\,\!\?\;\:\-\(\)\[\]\{\}]', ' ', text)
+        # Collapse whitespace and special characters that might interfere with chunking in one pass
+        text = SPECIAL_OR_WHITESPACE_PATTERN.sub(' ', text)
         
         # Normalize spacing around punctuation
-        text = re.sub(r'\s+([\.\,\!\?\;\:])', r'\1', text)
+        text = PUNCTUATION_SPACING_PATTERN.sub(r'\1', text)
         
         return text.strip()
     
     def _split_into_sentences(self, text: str) -> List[str]:
         """Split text into sentences using regex patterns."""
-        # Split on sentence endings followed by space or end of text
-        sentence_pattern = r'(?<=[.!?])\s+(?=[A-Z])'
-        sentences = re.split(sentence_pattern, text)
-        
-        # Clean up sentences
-        cleaned_sentences = []
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if sentence and len(sentence) > 10:  # Filter out very short fragments
-                cleaned_sentences.append(sentence)
-        
-        return cleaned_sentences
+        # Split on sentence endings, stripping and dropping very short fragments in one pass
+        return [
+            sentence for sentence in map(str.strip, SENTENCE_BOUNDARY_PATTERN.split(text))
+            if len(sentence) > 10
+        ]
     
     def _create_chunk_data(self, content: str, chunk_id: int, metadata: Dict[str, Any], chunk_index: int) -> Dict[str, Any]:
         """Create chunk data structure."""
-        import uuid
-        
         # Create unique ID for this chunk
-        chunk_uuid = str(uuid.uuid4())
-        
-        # Prepare chunk metadata
-        chunk_metadata = {
-            "type": "chunk",
-            "chunk_id": chunk_id,
-            "chunk_index": chunk_index,
-            "chunk_size": len(content),
-            "is_chunk": True
-        }
+        chunk_uuid = f"{_CHUNK_ID_PREFIX}-{next(_chunk_counter)}"
         
-        # Merge with original metadata
-        if metadata:
-            # Remove any conflicting keys
-            for key in ["id", "chunk_id", "chunk_index", "chunk_size", "is_chunk"]:
-                metadata.pop(key, None)
-            chunk_metadata.update(metadata)
+        # Merge with original metadata; chunk fields take precedence and the source id is dropped
+        chunk_metadata = {"type": "chunk", **metadata} if metadata else {"type": "chunk"}
+        chunk_metadata.pop("id", None)
+        chunk_metadata["chunk_id"] = chunk_id
+        chunk_metadata["chunk_index"] = chunk_index
+        chunk_metadata["chunk_size"] = len(content)
+        chunk_metadata["is_chunk"] = True
         
         return {
             "id": chunk_uuid,
@@ -149,7 +220,9 @@ class TextChunker:
         if not chunks:
             return {"total_chunks": 0, "avg_chunk_size": 0, "total_content": 0}
         
-        total_content = sum(len(chunk["content"]) for chunk in chunks)
+        # Read each chunk's length once; sum/min/max then run over the list in C
+        chunk_sizes = [len(chunk["content"]) for chunk in chunks]
+        total_content = sum(chunk_sizes)
         avg_chunk_size = total_content / len(chunks)
         
         return {
@@ -157,7 +230,7 @@ class TextChunker:
             "avg_chunk_size": round(avg_chunk_size, 2),
             "total_content": total_content,
             "chunk_size_range": {
-                "min": min(len(chunk["content"]) for chunk in chunks),
-                "max": max(len(chunk["content"]) for chunk in chunks)
+                "min": min(chunk_sizes),
+                "max": max(chunk_sizes)
             }
         }
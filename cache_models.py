@@ -5,6 +5,7 @@ Downloads and caches required models if they don't exist.
 """
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 def check_model_exists(model_path: str) -> bool:
@@ -13,29 +14,40 @@ def check_model_exists(model_path: str) -> bool:
     return cache_dir.exists() and cache_dir.is_dir()
 
 def cache_sentence_transformers():
-    """Cache sentence transformers model if it doesn't exist."""
+    """Cache the embedding model if it doesn't exist, warming it up through the service's loader."""
     try:
-        from sentence_transformers import SentenceTransformer
+        from app.config.settings import get_settings
+        from app.services.chroma_service import load_embedding_model
+        from app.utils.onnx_embedder import ONNX_MODEL_CACHE_DIRECTORY
         
-        model_name = "all-MiniLM-L6-v2"
+        settings = get_settings()
+        model_name = settings.embedding_model
         cache_path = f"./model_cache/models--sentence-transformers--{model_name.replace('/', '--')}"
         
         if check_model_exists(cache_path):
             print(f"Sentence Transformers model already cached: {model_name}")
             return True
         
-        print(f"Downloading Sentence Transformers model: {model_name}")
-        model = SentenceTransformer(model_name)
+        # Same backend and precision path as the service, so a missing quantization or ONNX dependency fails the build
+        print(f"Downloading embedding model: {model_name} ({settings.embedding_backend}, {settings.embedding_precision})")
+        model = load_embedding_model(
+            settings.embedding_backend,
+            model_name,
+            ONNX_MODEL_CACHE_DIRECTORY,
+            settings.huggingface_token,
+            settings.embedding_precision
+        )
         
-        test_embedding = model.encode(["test sentence"])
-        print(f"Sentence Transformers model cached successfully: {model_name}")
+        test_embedding = model.encode(["test sentence"], convert_to_numpy=True, normalize_embeddings=True)
+        print(f"Embedding model cached successfully: {model_name} (applied precision: {model._applied_precision})")
         print(f"Test embedding shape: {test_embedding.shape}")
         
+        load_embedding_model.cache_clear()
         del model
         return True
         
     except Exception as e:
-        print(f"Failed to cache Sentence Transformers model: {e}")
+        print(f"Failed to cache embedding model: {e}")
         return False
 
 def cache_onnx_model():
@@ -71,14 +83,13 @@ def main():
     os.makedirs("./model_cache", exist_ok=True)
     os.makedirs("./model_cache/onnx_models", exist_ok=True)
     
-    success_count = 0
-    total_models = 2
+    # The downloads are independent and network-bound, so run them side by side
+    cache_steps = [cache_sentence_transformers, cache_onnx_model]
+    with ThreadPoolExecutor(max_workers=len(cache_steps)) as executor:
+        results = list(executor.map(lambda cache_step: cache_step(), cache_steps))
     
-    if cache_sentence_transformers():
-        success_count += 1
-    
-    if cache_onnx_model():
-        success_count += 1
+    success_count = sum(results)
+    total_models = len(cache_steps)
     
     print(f"Model caching complete: {success_count}/{total_models} models cached")
     
@@ -1,9 +1,14 @@
 """
 AI Student Support Service - Main Application Entry Point
 """
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
+import anyio.to_thread
+from cachetools import TTLCache
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from contextlib import asynccontextmanager
@@ -18,12 +23,27 @@ from app.utils.exception_handler import (
 # Configure logging
 logger = get_logger(__name__)
 
+# Under `gunicorn --preload`, load the embedding model in the master so forked workers share it
+from app.config.settings import get_settings
+if get_settings().preload_embedding_model:
+    from app.services.chroma_service import preload_embedding_model
+    preload_embedding_model()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application startup and shutdown lifecycle."""
     logger.info("Starting AI Student Support Service...")
     
+    # Size both thread pools: asyncio.to_thread uses the loop's executor, sync endpoints use anyio's limiter
+    worker_threads = get_settings().worker_threads
+    if worker_threads:
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=worker_threads, thread_name_prefix="worker")
+        )
+        anyio.to_thread.current_default_thread_limiter().total_tokens = worker_threads
+        logger.info(f"Blocking work limited to {worker_threads} threads")
+    
     # Initialize all services during startup
     try:
         from app.utils.service_utils import get_services
@@ -58,6 +78,14 @@ async def lifespan(app: FastAPI):
     yield
     
     logger.info("Shutting down AI Student Support Service...")
+    
+    from app.utils.service_manager import get_ai_service
+    ai_service = get_ai_service()
+    if ai_service:
+        await ai_service.close()
+    
+    from app.utils.cpu_pool import shutdown_cpu_pool
+    shutdown_cpu_pool()
 
 
 # Create FastAPI app
@@ -104,6 +132,7 @@ app = FastAPI(
             "description": "System health and service status checks"
         }
     ],
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -112,7 +141,7 @@ app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(StarletteHTTPException, http_exception_handler)
 app.add_exception_handler(Exception, general_exception_handler)
 
-# CORS middleware
+# CORS middleware (pure ASGI with headers precomputed at startup; requests without an Origin pass straight through)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -134,58 +163,75 @@ app.include_router(search_router, prefix="/api/v1/search", tags=["Search"])
 app.include_router(health_router, prefix="/health", tags=["Health"])
 
 
+# Static part of the root response, built once
+ROOT_INFO: Dict[str, Any] = {
+    "service": "AI Student Support Service",
+    "version": "2.0.0",
+    "status": "running",
+    "description": "AI-powered student support with RAG and DeepSeek AI capabilities",
+    "features": [
+        "DeepSeek AI v3.1 integration",
+        "RAG (Retrieval-Augmented Generation)",
+        "Intelligent escalation data generation",
+        "LLM-generated escalation messages",
+        "ChromaDB vector database",
+        "Document management system",
+        "Semantic search capabilities",
+        "Real-time service monitoring"
+    ],
+    "endpoints": {
+        "chat": "/api/v1/chat",
+        "documents": "/api/v1/documents",
+        "search": "/api/v1/search",
+        "health": "/health",
+        "docs": "/docs"
+    },
+    "ai_provider": "DeepSeek Chat v3.1 (via OpenRouter)",
+    "escalation": "Data generation only - backend handles storage and triggering",
+    "architecture": "AI microservice - backend handles business logic"
+}
+
+# Seconds the services status shown on the root endpoint is reused across probes
+ROOT_STATUS_TTL_SECONDS = 5.0
+_root_status_cache: TTLCache = TTLCache(maxsize=1, ttl=ROOT_STATUS_TTL_SECONDS)
+
+
 @app.get("/", tags=["Root"])
 async def root() -> Dict[str, Any]:
     """Root endpoint providing service information."""
-    # Get global services from service manager
-    from app.utils.service_manager import get_global_services
-    ai_service, rag_service, chroma_service = get_global_services()
-    
-    # Check service status
-    services_status = {}
-    if ai_service:
-        services_status["ai_service"] = ai_service.get_status() if hasattr(ai_service, 'get_status') else {"status": "initialized"}
-    if rag_service:
-        services_status["rag_service"] = rag_service.get_status() if hasattr(rag_service, 'get_status') else {"status": "initialized"}
-    if chroma_service:
-        services_status["chroma_service"] = chroma_service.get_status() if hasattr(chroma_service, 'get_status') else {"status": "initialized"}
+    services_status = _root_status_cache.get("status")
+    if services_status is None:
+        # Get global services from service manager
+        from app.utils.service_manager import get_global_services
+        from app.utils.service_utils import probe_services_status
+        ai_service, rag_service, chroma_service = get_global_services()
+        
+        services_status = await probe_services_status({
+            "ai_service": ai_service,
+            "rag_service": rag_service,
+            "chroma_service": chroma_service
+        })
+        _root_status_cache["status"] = services_status
     
-    return {
-        "service": "AI Student Support Service",
-        "version": "2.0.0",
-        "status": "running",
-        "description": "AI-powered student support with RAG and DeepSeek AI capabilities",
-        "services_status": services_status,
-        "features": [
-            "DeepSeek AI v3.1 integration",
-            "RAG (Retrieval-Augmented Generation)",
-            "Intelligent escalation data generation",
-            "LLM-generated escalation messages",
-            "ChromaDB vector database",
-            "Document management system",
-            "Semantic search capabilities",
-            "Real-time service monitoring"
-        ],
-        "endpoints": {
-            "chat": "/api/v1/chat",
-            "documents": "/api/v1/documents",
-            "search": "/api/v1/search",
-            "health": "/health",
-            "docs": "/docs"
-        },
-        "ai_provider": "DeepSeek Chat v3.1 (via OpenRouter)",
-        "escalation": "Data generation only - backend handles storage and triggering",
-        "architecture": "AI microservice - backend handles business logic"
-    }
+    return {**ROOT_INFO, "services_status": services_status}
 
 
 if __name__ == "__main__":
     import uvicorn
+    settings = get_settings()
+    if settings.workers > 1 and not settings.debug:
+        logger.warning(
+            "Running %d workers: search and RAG caches are per process, so document changes "
+            "only invalidate the worker that handled them (the CAG corpus stays stale until restart)",
+            settings.workers
+        )
+    # uvicorn[standard] picks uvloop and httptools automatically; reload is for local development only
     uvicorn.run(
         "main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
+        host=settings.host,
+        port=settings.port,
+        reload=settings.debug,
+        workers=1 if settings.debug else settings.workers,
+        limit_concurrency=settings.limit_concurrency or None,
         log_level="info"
     )
-